@@ -0,0 +1,104 @@
+import time
+from redis.client import NEVER_DECODE
+from app.core import config
+from app.cache.redis_client import get_redis_client
+
+# Delete the lock only if we still hold it (the lease may have expired and been re-acquired)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def tag_key(tag: str) -> str:
+    """
+    Sorted set of the keys recorded under a tag, scored by when each key expires
+    ("v2": earlier versions kept a plain set, which is left to expire on its own)
+    """
+    return f"tag:v2:{tag}"
+
+
+class RedisCacheBackend:
+    """
+    Async cache backend on top of the shared redis.asyncio client
+    Every read and write awaits the network round trip instead of blocking the event loop.
+    """
+    async def get(self, key: str):
+        # Cached payloads are binary; skip the client's decode_responses for them
+        return await get_redis_client().execute_command("GET", key, **{NEVER_DECODE: True})
+
+    async def get_with_ttl(self, key: str):
+        """
+        Return (value, remaining ttl in seconds) in a single round trip
+        """
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.execute_command("GET", key, **{NEVER_DECODE: True})
+            value, pttl = await pipe.pttl(key).execute()
+        return value, (pttl / 1000 if pttl and pttl > 0 else 0)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: list[str] | tuple[str, ...] = ()):
+        """
+        Write an entry; its tags go in the same round trip
+        Each write also drops members whose entries have already expired, so a busy tag
+        only ever holds live keys.
+        """
+        if not tags:
+            await get_redis_client().set(key, value, ex=ttl)
+            return
+
+        now = time.time()
+        tag_ttl = max(ttl, config.CACHE_TAG_TTL_SECONDS)
+        async with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl)
+            for tag in tags:
+                pipe.zadd(tag_key(tag), {key: now + ttl})
+                pipe.zremrangebyscore(tag_key(tag), "-inf", now)
+                pipe.expire(tag_key(tag), tag_ttl)
+            await pipe.execute()
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await get_redis_client().delete(*keys)
+
+    async def delete_tags(self, *tags: str) -> list[str]:
+        """
+        Delete every key registered under the given tags and the tag sets themselves
+        Reading and dropping the tag sets happens in one MULTI, so a key tagged concurrently
+        lands in a new set instead of being lost. Cost is O(live members), with no keyspace scan.
+        """
+        if not tags:
+            return []
+        tag_keys = [tag_key(tag) for tag in tags]
+        now = time.time()
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            for key in tag_keys:
+                pipe.zrangebyscore(key, now, "+inf")
+            pipe.delete(*tag_keys)
+            results = await pipe.execute()
+
+        keys = sorted(set().union(*results[:-1]))
+        if keys:
+            await get_redis_client().delete(*keys)
+        return keys
+
+    async def acquire_lock(self, key: str, token: str, lease: float) -> bool:
+        """
+        Try to take the recompute lock for a key; it expires on its own after `lease` seconds
+        """
+        return bool(await get_redis_client().set(f"lock:{key}", token, nx=True, px=int(lease * 1000)))
+
+    async def release_lock(self, key: str, token: str):
+        await get_redis_client().eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+
+
+_backend = RedisCacheBackend()
+
+
+def get_cache_backend():
+    """
+    Return the cache backend used by the cache_response decorator
+    """
+    return _backend
@@ -1,48 +1,204 @@
-import json
+import asyncio
+import inspect
+import logging
+import math
+import random
+import time
+import uuid
 from functools import wraps
+from string import Formatter
 from fastapi import Request
-from app.cache.redis_client import get_redis_client
-from app.cache.metrics import record_hit, record_miss
+from app.core import config
+from app.cache.backend import get_cache_backend
+from app.cache.entry import CachedResponse, build_entry, pack, unpack, to_response
+from app.cache.keys import build_cache_key
+from app.cache.local import local_cache
+from app.cache.metrics import (
+    record_hit, record_miss, record_coalesced, record_lock_wait_timeout, record_stale_hit, record_early_refresh, observe,
+    remember_recipe,
+)
+from app.cache.singleflight import single_flight
+from app.cache.warmup import WARMUP_HEADER, make_recipe
 
-def cache_response(ttl: int = 60):
+logger = logging.getLogger(__name__)
+
+# Strong references to background refresh tasks so they are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _should_refresh_early(fresh_until: float, delta: float, beta: float) -> bool:
+    """
+    XFetch: refresh before expiry with a probability that rises as expiry gets closer
+    and as the endpoint gets slower to recompute (delta seconds)
+    """
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= fresh_until
+
+
+def _refresh_in_background(cache_key: str, load):
+    async def run():
+        try:
+            await single_flight(f"refresh:{cache_key}", load)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {cache_key}: {e}")
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _check_tag_templates(func, tags) -> None:
+    """
+    Fail at import time, not on every request, if a tag names a parameter the endpoint doesn't take
+    """
+    params = inspect.signature(func).parameters
+    for tag in tags:
+        for _, field, _, _ in Formatter().parse(tag):
+            if field is not None and field not in params:
+                raise ValueError(f"Cache tag {tag!r} on {func.__name__} uses unknown path parameter {field!r}")
+
+
+def _format_tag(tag: str, path_params: dict) -> str:
+    try:
+        return tag.format(**path_params)
+    except (KeyError, IndexError, ValueError):
+        # e.g. a query parameter named in the tag: record it under the literal tag
+        return tag
+
+
+def cache_response(
+    ttl: int = 60,
+    local_ttl: int | None = None,
+    stale_ttl: int = 0,
+    xfetch_beta: float = 0.0,
+    vary: tuple[str, ...] = (),
+    namespace: str | None = None,
+    version: int | None = None,
+    tags: list[str] | tuple[str, ...] = (),
+):
     """
     Custom decorator to cache API responses in Redis
+    All cache I/O goes through the async backend, so lookups never block the event loop.
     - ttl: Time to live for the cache in seconds.
+    - local_ttl: If set, also keep the encoded response in the in-process L1 cache
+      for this many seconds (never longer than the Redis entry has left).
+    - stale_ttl: Stale-while-revalidate window. For this many seconds after `ttl` the old
+      response is still served immediately while a background task refreshes it.
+    - xfetch_beta: If > 0, hot keys are refreshed in the background shortly before they
+      expire (XFetch); 1.0 is a good default, higher refreshes earlier.
+    - vary: Request headers that select a different cached representation
+      (e.g. ("accept", "accept-encoding", "authorization")).
+    - namespace / version: Key prefix for this endpoint family; bump version to rotate it.
+    - tags: Tags to record each cached key under, for invalidate_tags(). Path params can be
+      interpolated (e.g. "user:{user_id}"); the namespace, if any, is added as a tag too.
     - If 'nocache' query parameter is set to true, it skips caching.
+    - Cached dict results are stored as the final JSON body plus headers and returned as a raw
+      Response with a strong ETag; a matching If-None-Match gets a 304 with no body.
+    - Concurrent misses on the same key are coalesced: one request per worker runs the
+      endpoint, and a short Redis lock lets only one worker recompute at a time.
     """
     def decorator(func):
+        _check_tag_templates(func, tags)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Extract the request object from args or kwargs
             request: Request = kwargs.get("request") or args[0]
-            # Get query parameters as a dict
-            query_params = dict(request.query_params)
             # Check if 'nocache' query param is set to true to skip cache
-            skip_cache = query_params.get("nocache", "false").lower() == "true"
-
-            # Generate a cache key using HTTP method and URL path
-            cache_key = f"{request.method}:{request.url.path}"
-            redis = get_redis_client()
-
-            # If not skipping cache, try to fetch from Redis
-            if not skip_cache:
-                cached = redis.get(cache_key)
-                if cached:
-                    # Cache hit: record and return cached response
-                    record_hit(cache_key)
-                    return json.loads(cached)
-                else:
-                    # Cache miss: record miss
-                    record_miss(cache_key)
-
-            # Call the actual endpoint function
-            response = await func(*args, **kwargs)
-
-            # Store response in cache if it's a dict and not skipping cache
-            if not skip_cache and isinstance(response, dict):
-                redis.set(cache_key, json.dumps(response), ex=ttl)
-
-            # Return the response (from cache or fresh)
-            return response
+            skip_cache = request.query_params.get("nocache", "false").lower() == "true"
+
+            # Generate a cache key from method, path, normalized query params and vary headers
+            cache_key = build_cache_key(request, vary, namespace, version)
+            key_tags = [_format_tag(tag, request.path_params) for tag in tags]
+            if namespace:
+                key_tags.append(namespace)
+            backend = get_cache_backend()
+
+            # Bypass: call the endpoint directly and leave the cache untouched
+            if skip_cache:
+                return await func(*args, **kwargs)
+
+            async def load(background: bool = False):
+                # Only one worker recomputes; the others wait briefly for its result
+                token = uuid.uuid4().hex
+                locked = await backend.acquire_lock(cache_key, token, config.CACHE_LOCK_LEASE_SECONDS)
+                if not locked:
+                    if background:
+                        return None  # another worker is already refreshing this key
+                    deadline = time.monotonic() + config.CACHE_LOCK_WAIT_SECONDS
+                    while time.monotonic() < deadline:
+                        await asyncio.sleep(config.CACHE_LOCK_POLL_SECONDS)
+                        cached = await backend.get(cache_key)
+                        if cached:
+                            record_coalesced("remote")
+                            return unpack(cached)
+                    record_lock_wait_timeout()
+
+                try:
+                    # Call the actual endpoint function, timing it for XFetch
+                    start = time.perf_counter()
+                    response = await func(*args, **kwargs)
+                    delta = time.perf_counter() - start
+                    observe("backend_seconds", delta)
+
+                    # Store the encoded response if it's a dict; Redis keeps it through the stale window
+                    if not isinstance(response, dict):
+                        return response
+                    entry = build_entry(response, ttl, delta, vary)
+                    observe("payload_bytes", entry.size)
+                    recipe = make_recipe(request, vary)
+                    if recipe is not None:
+                        remember_recipe(cache_key, recipe)
+                    await backend.set(cache_key, pack(entry), ttl + stale_ttl, key_tags)
+                    if local_ttl:
+                        local_cache.set(cache_key, entry, min(local_ttl, ttl), entry.size)
+                    return entry
+                finally:
+                    if locked:
+                        await backend.release_lock(cache_key, token)
+
+            # Try L1 first, then Redis
+            lookup_start = time.perf_counter()
+            if local_ttl:
+                # Warm-up replays look past L1 so that Redis gets refilled for every worker
+                local = None if WARMUP_HEADER in request.headers else local_cache.get(cache_key)
+                if local is not None:
+                    record_hit(cache_key, tier="local")
+                    observe("lookup_seconds", time.perf_counter() - lookup_start)
+                    return to_response(request, local)
+                cached, remaining_ttl = await backend.get_with_ttl(cache_key)
+            else:
+                cached = await backend.get(cache_key)
+            observe("lookup_seconds", time.perf_counter() - lookup_start)
+
+            if cached:
+                # Cache hit: record and return the stored bytes as-is
+                record_hit(cache_key)
+                entry = unpack(cached)
+                now = time.time()
+
+                if entry.fresh_until is not None and now >= entry.fresh_until:
+                    # Past ttl but inside stale_ttl: serve stale, refresh off the request path
+                    record_stale_hit()
+                    _refresh_in_background(cache_key, lambda: load(background=True))
+                    return to_response(request, entry)
+
+                if xfetch_beta and entry.fresh_until is not None and _should_refresh_early(entry.fresh_until, entry.delta, xfetch_beta):
+                    record_early_refresh()
+                    _refresh_in_background(cache_key, lambda: load(background=True))
+
+                if local_ttl:
+                    if entry.fresh_until is not None:
+                        remaining_ttl = min(remaining_ttl, entry.fresh_until - now)
+                    local_cache.set(cache_key, entry, min(local_ttl, remaining_ttl), entry.size)
+                return to_response(request, entry)
+
+            # Cache miss: record miss
+            record_miss(cache_key)
+
+            # Concurrent misses in this worker share one load(); each caller gets its own Response
+            result = await single_flight(cache_key, load)
+            if isinstance(result, CachedResponse):
+                return to_response(request, result)
+            return result
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,100 @@
+import hashlib
+import time
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.cache.serializer import encode, decode_framed
+
+# Marks values written with metadata; plain JSON written by older code has no marker.
+# Version 1 held the decoded "data"; version 2 the encoded HTTP body as a string inside the
+# envelope; version 3 keeps the body as raw bytes after the envelope (see serializer.encode).
+ENVELOPE_MARKER = "__cache__"
+
+
+class CachedResponse:
+    """
+    A fully encoded HTTP response as stored in the cache, plus freshness metadata
+    """
+    __slots__ = ("body", "status", "headers", "fresh_until", "delta")
+
+    def __init__(self, body: bytes, status: int, headers: dict, fresh_until: float | None, delta: float):
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.fresh_until = fresh_until
+        self.delta = delta
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag derived from the exact response bytes
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def build_entry(response: dict, ttl: int, delta: float, vary: tuple[str, ...] = ()) -> CachedResponse:
+    """
+    Encode an endpoint's dict result the same way FastAPI would, once, for every later hit
+    """
+    body = JSONResponse(content=jsonable_encoder(response)).body
+    headers = {"content-type": "application/json", "etag": make_etag(body)}
+    if vary:
+        headers["vary"] = ", ".join(vary)
+    return CachedResponse(body, 200, headers, time.time() + ttl, delta)
+
+
+def pack(entry: CachedResponse) -> bytes:
+    """
+    Serialize a cached response for Redis
+    """
+    return encode({
+        ENVELOPE_MARKER: 3,
+        "status": entry.status,
+        "headers": entry.headers,
+        "fresh_until": entry.fresh_until,
+        "delta": entry.delta,
+    }, body=entry.body)
+
+
+def unpack(raw: bytes | str) -> CachedResponse:
+    """
+    Decode a cached value; older formats are re-encoded and treated as fresh while Redis keeps them
+    """
+    decoded, body = decode_framed(raw)
+    version = decoded.get(ENVELOPE_MARKER) if isinstance(decoded, dict) else None
+    if version == 3:
+        return CachedResponse(body, decoded["status"], decoded["headers"], decoded["fresh_until"], decoded["delta"])
+    if version == 2:
+        return CachedResponse(
+            decoded["body"].encode(), decoded["status"], decoded["headers"], decoded["fresh_until"], decoded["delta"]
+        )
+
+    if version == 1:
+        data, fresh_until, delta = decoded["data"], decoded["fresh_until"], decoded["delta"]
+    else:
+        data, fresh_until, delta = decoded, None, 0.0
+    body = JSONResponse(content=data).body
+    headers = {"content-type": "application/json", "etag": make_etag(body)}
+    return CachedResponse(body, 200, headers, fresh_until, delta)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def to_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    Build the raw response for a cached entry, or a bodiless 304 if the client already has it
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry.headers["etag"]):
+        headers = {name: value for name, value in entry.headers.items() if name != "content-type"}
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, status_code=entry.status, headers=entry.headers)
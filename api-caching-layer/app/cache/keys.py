@@ -0,0 +1,84 @@
+import hashlib
+from urllib.parse import urlencode
+from fastapi import Request
+from app.core import config
+
+# Query params that never change the response (cache busters and the bypass switch)
+VOLATILE_PARAMS = {"nocache", "_", "cb", "timestamp"}
+
+# Headers whose raw values must not end up in Redis keys; only a digest is kept
+SENSITIVE_HEADERS = {"authorization", "cookie", "x-api-key"}
+
+
+def _digest(value: str, length: int = 64) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:length]
+
+
+def _normalize_header(name: str, value: str) -> str:
+    if name in SENSITIVE_HEADERS:
+        return _digest(value, 16)
+    # "gzip, br" and "gzip,br" negotiate the same representation
+    return ",".join(part.strip() for part in value.lower().split(","))
+
+
+def key_prefix(namespace: str | None = None, version: int | None = None) -> str:
+    """
+    Prefix shared by a family of keys, e.g. "v3:posts:v2:"
+    Bumping CACHE_KEY_VERSION or a namespace version moves the family to fresh keys without scanning Redis.
+    """
+    prefix = f"v{config.CACHE_KEY_VERSION}:" if config.CACHE_KEY_VERSION else ""
+    if namespace:
+        prefix += f"{namespace}:v{version or 1}:"
+    return prefix
+
+
+def build_cache_key(request: Request, vary: tuple[str, ...] = (), namespace: str | None = None, version: int | None = None) -> str:
+    """
+    Build a cache key from the method, path, normalized query string and selected request headers
+    - Query params are sorted and volatile ones (see VOLATILE_PARAMS) are dropped.
+    - vary: header names to include (e.g. "accept", "accept-encoding", "authorization").
+    - Keys longer than CACHE_KEY_MAX_LENGTH are replaced by a fixed-length hash under the same prefix.
+    Without query params or vary headers this is the plain "GET:/api/posts/" form.
+    """
+    key = f"{request.method}:{request.url.path}"
+
+    params = sorted(
+        (name, value.strip())
+        for name, value in request.query_params.multi_items()
+        if name.lower() not in VOLATILE_PARAMS
+    )
+    if params:
+        key += "?" + urlencode(params)
+
+    for name in vary:
+        name = name.lower()
+        value = request.headers.get(name)
+        key += f"|{name}={_normalize_header(name, value) if value is not None else ''}"
+
+    prefix = key_prefix(namespace, version)
+    if len(prefix) + len(key) > config.CACHE_KEY_MAX_LENGTH:
+        key = f"sha256:{_digest(key)}"
+    return prefix + key
+
+
+# The cache layer's own bookkeeping keys, as opposed to cached responses
+INTERNAL_FAMILIES = ("tag", "lock", "warmup", "metrics")
+
+
+def key_family(key: str) -> str:
+    """
+    Group a Redis key into a family for stats, e.g. "GET:/api/users/7?x=1" -> "GET:/api/users"
+    Internal keys group by their type ("tag", "lock", "warmup", "metrics"); hashed keys keep only their prefix.
+    """
+    for internal in INTERNAL_FAMILIES:
+        if key.startswith(internal + ":"):
+            return internal
+
+    head, sep, path = key.partition(":/")
+    if not sep:
+        prefix, hashed, _ = key.rpartition("sha256:")
+        return prefix + "sha256" if hashed else "other"
+
+    path = path.split("?", 1)[0].split("|", 1)[0]
+    segments = [segment for segment in path.split("/") if segment][:2]
+    return f"{head}:/" + "/".join(segments)
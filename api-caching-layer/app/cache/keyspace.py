@@ -0,0 +1,55 @@
+from collections import defaultdict
+from app.cache.keys import key_family, INTERNAL_FAMILIES
+from app.cache.redis_client import get_redis_client
+
+SCAN_BATCH = 100
+
+
+async def count_keys() -> int:
+    """
+    Total keys in the cache database, including internal ones (DBSIZE is O(1), unlike KEYS *)
+    """
+    return await get_redis_client().dbsize()
+
+
+async def sample_keyspace(sample_size: int, total_keys: int):
+    """
+    Estimate key counts and memory per key family from a SCAN sample
+    SCAN walks the keyspace in small batches, so Redis keeps serving other clients in between.
+    Memory comes from MEMORY USAGE on the sampled keys, pipelined one batch at a time.
+    """
+    redis = get_redis_client()
+    families = defaultdict(lambda: {"sampled_keys": 0, "sampled_bytes": 0})
+    sampled = 0
+    cursor = 0
+
+    while sampled < sample_size:
+        cursor, keys = await redis.scan(cursor=cursor, count=SCAN_BATCH)
+        keys = keys[: sample_size - sampled]
+        if keys:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.memory_usage(key)
+                sizes = await pipe.execute()
+            for key, size in zip(keys, sizes):
+                family = families[key_family(key)]
+                family["sampled_keys"] += 1
+                family["sampled_bytes"] += size or 0  # None if the key expired mid-scan
+            sampled += len(keys)
+        if cursor == 0:
+            break
+
+    # Scale the sample up to the whole keyspace
+    scale = total_keys / sampled if sampled else 0
+    for family in families.values():
+        family["avg_bytes"] = round(family["sampled_bytes"] / family["sampled_keys"])
+        family["estimated_keys"] = round(family["sampled_keys"] * scale)
+        family["estimated_bytes"] = round(family["sampled_bytes"] * scale)
+
+    # Everything but the cache layer's own tag/lock/warm-up/metrics keys
+    internal = sum(families[name]["estimated_keys"] for name in INTERNAL_FAMILIES if name in families)
+    return {
+        "sampled_keys": sampled,
+        "estimated_cached_keys": max(0, total_keys - internal),
+        "families": dict(families),
+    }
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+from app.core import config
+from app.cache.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class LocalLRUCache:
+    """
+    Bounded in-process LRU cache holding decoded responses
+    - max_bytes: budget for the summed payload sizes; least recently used entries are evicted first.
+    - Entries expire after their own TTL, which callers keep no longer than the Redis TTL.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        # Structure: { key: (expires_at, size, value) }, oldest access first
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, value = entry
+        if time.monotonic() >= expires_at:
+            self.delete(key)
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int):
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self.current_bytes += size
+
+        # Evict least recently used entries until we fit the byte budget
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= entry[1]
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+local_cache = LocalLRUCache(max_bytes=config.LOCAL_CACHE_MAX_BYTES)
+
+
+async def publish_invalidation(*keys: str):
+    """
+    Evict keys from this worker's L1 and tell every other worker to do the same
+    """
+    for key in keys:
+        local_cache.delete(key)
+    if keys:
+        await get_redis_client().publish(config.CACHE_INVALIDATION_CHANNEL, "\n".join(keys))
+
+
+async def _listen_for_invalidations():
+    """
+    Subscribe to the invalidation channel and evict announced keys from L1
+    Reconnects after Redis errors; L1 is cleared on reconnect since messages may have been missed.
+    """
+    while True:
+        pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(config.CACHE_INVALIDATION_CHANNEL)
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                if message and message["type"] == "message":
+                    for key in message["data"].split("\n"):
+                        local_cache.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener lost Redis connection: {e}")
+            local_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+
+_listener_task = None
+
+
+def start_invalidation_listener():
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+    _listener_task = None
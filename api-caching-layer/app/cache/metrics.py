@@ -1,24 +1,250 @@
-from collections import Counter
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from app.core import config
+from app.cache.local import local_cache
+from app.cache.redis_client import get_redis_client
+from app.cache.stats import SpaceSaving, Histogram, bucket_quantile
 
-cache_stats = {
-    "hits": 0,
-    "misses": 0,
-    "access_log": Counter()  # Tracks key access frequency
+logger = logging.getLogger(__name__)
+
+# Per-worker counters. Each worker only touches its own numbers on the event loop (no locks);
+# flush_metrics() pushes the deltas to Redis so every worker can report cluster-wide totals.
+COUNTERS = (
+    "hits",
+    "misses",
+    "local_hits",  # Served from the in-process L1 tier
+    "redis_hits",  # Served from Redis after an L1 miss
+    "coalesced_local",  # Misses that joined an in-flight computation in this worker
+    "coalesced_remote",  # Misses served by waiting on another worker's recompute lock
+    "lock_wait_timeouts",  # Gave up waiting on another worker and recomputed
+    "stale_hits",  # Served past ttl while a background refresh ran
+    "early_refreshes",  # XFetch refreshes started before expiry
+)
+
+cache_stats = {name: 0 for name in COUNTERS}
+cache_stats["access_log"] = SpaceSaving(config.METRICS_TOP_KEYS_CAPACITY)  # Bounded key access frequency
+
+LATENCY_BOUNDS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+SIZE_BOUNDS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+histograms = {
+    "lookup_seconds": Histogram(LATENCY_BOUNDS),  # L1 + Redis lookup, hit or miss
+    "backend_seconds": Histogram(LATENCY_BOUNDS),  # Endpoint execution on a miss or refresh
+    "payload_bytes": Histogram(SIZE_BOUNDS),  # Size of each stored response
 }
 
-def record_hit(key: str):
+# Redis keys holding the aggregated numbers of every worker
+COUNTERS_KEY = "metrics:cache:counters"
+HISTOGRAM_KEY = "metrics:cache:hist:{}"
+TOP_KEYS_KEY = "metrics:cache:top"
+RECIPE_KEY = "warmup:{}"
+
+# How to replay each key this worker has cached (see warmup.make_recipe), for the hottest keys only.
+# flush_metrics() persists the recipes of the top CACHE_WARMUP_KEYS keys to Redis; this copy
+# survives a Redis flush.
+recipes: OrderedDict[str, str] = OrderedDict()
+
+def record_hit(key: str, tier: str = "redis"):
     cache_stats["hits"] += 1
-    cache_stats["access_log"][key] += 1
+    cache_stats[f"{tier}_hits"] += 1
+    cache_stats["access_log"].add(key)
 
 def record_miss(key: str):
     cache_stats["misses"] += 1
-    cache_stats["access_log"][key] += 1
+    cache_stats["access_log"].add(key)
 
-def get_metrics():
-    top_keys = cache_stats["access_log"].most_common(5)
+def record_coalesced(scope: str):
+    cache_stats[f"coalesced_{scope}"] += 1
+
+def record_lock_wait_timeout():
+    cache_stats["lock_wait_timeouts"] += 1
+
+def record_stale_hit():
+    cache_stats["stale_hits"] += 1
+
+def record_early_refresh():
+    cache_stats["early_refreshes"] += 1
+
+def remember_recipe(cache_key: str, recipe: str):
+    recipes[cache_key] = recipe
+    recipes.move_to_end(cache_key)
+    while len(recipes) > config.METRICS_TOP_KEYS_CAPACITY:
+        recipes.popitem(last=False)
+
+def observe(name: str, value: float):
+    histograms[name].observe(value)
+
+def _ratio(hits: int, lookups: int):
+    return round(hits / lookups, 4) if lookups else None
+
+def _summarize(stats: dict, top_keys, latency: dict):
+    lookups = stats["hits"] + stats["misses"]
+    # Every lookup reaches L1 first; only L1 misses reach Redis
+    redis_lookups = lookups - stats["local_hits"]
     return {
-        "hits": cache_stats["hits"],
-        "misses": cache_stats["misses"],
+        "hits": stats["hits"],
+        "misses": stats["misses"],
         "top_keys": top_keys, # Records the top 5 accessed keys
-        "total_cached_keys": None
+        "total_keys": None,
+        "tiers": {
+            "local": {"hits": stats["local_hits"], "hit_ratio": _ratio(stats["local_hits"], lookups)},
+            "redis": {"hits": stats["redis_hits"], "hit_ratio": _ratio(stats["redis_hits"], redis_lookups)},
+        },
+        "single_flight": {
+            "coalesced_local": stats["coalesced_local"],
+            "coalesced_remote": stats["coalesced_remote"],
+            "lock_wait_timeouts": stats["lock_wait_timeouts"],
+        },
+        "revalidation": {
+            "stale_hits": stats["stale_hits"],
+            "early_refreshes": stats["early_refreshes"],
+        },
+        "histograms": latency,
     }
+
+def _histogram_summary(bounds, buckets, total: float, count: int):
+    return {
+        "count": count,
+        "sum": round(total, 6),
+        "p50": bucket_quantile(bounds, buckets, 0.5),
+        "p99": bucket_quantile(bounds, buckets, 0.99),
+    }
+
+def get_metrics():
+    """
+    Metrics for this worker only
+    """
+    summary = _summarize(
+        cache_stats,
+        cache_stats["access_log"].most_common(5),
+        {name: _histogram_summary(h.bounds, *h.snapshot()) for name, h in histograms.items()},
+    )
+    summary["tiers"]["local"].update(local_cache.stats())
+    return summary
+
+
+# What this worker has already pushed to Redis, so each flush only sends the difference
+_flushed = {"counters": {}, "histograms": {}, "top": {}, "recipes": {}}
+# Flushes come from the periodic flusher and from every metrics request; without this,
+# overlapping flushes read the same _flushed baseline and push the same deltas twice
+_flush_lock = asyncio.Lock()
+
+async def flush_metrics():
+    """
+    Push this worker's counter, histogram and top-key deltas to Redis in one pipeline
+    """
+    async with _flush_lock:
+        await _flush_deltas()
+
+async def _flush_deltas():
+    counters = {name: cache_stats[name] for name in COUNTERS}
+    snapshots = {name: h.snapshot() for name, h in histograms.items()}
+    sketch = cache_stats["access_log"]
+    top = dict(sketch.counts)
+
+    async with get_redis_client().pipeline(transaction=False) as pipe:
+        for name, value in counters.items():
+            delta = value - _flushed["counters"].get(name, 0)
+            if delta:
+                pipe.hincrby(COUNTERS_KEY, name, delta)
+
+        for name, (buckets, total, count) in snapshots.items():
+            previous = _flushed["histograms"].get(name, ([0] * len(buckets), 0.0, 0))
+            if count == previous[2]:
+                continue
+            key = HISTOGRAM_KEY.format(name)
+            for index, (current, before) in enumerate(zip(buckets, previous[0])):
+                if current != before:
+                    pipe.hincrby(key, f"b{index}", current - before)
+            pipe.hincrbyfloat(key, "sum", total - previous[1])
+            pipe.hincrby(key, "count", count - previous[2])
+
+        for key, count in top.items():
+            # Keys new to the sketch only contribute the part of their count that is not inherited error
+            delta = count - _flushed["top"].get(key, sketch.errors.get(key, 0))
+            if delta > 0:
+                pipe.zincrby(TOP_KEYS_KEY, delta, key)
+        # Keep the shared top-keys set as bounded as the per-worker sketch
+        pipe.zremrangebyrank(TOP_KEYS_KEY, 0, -(config.METRICS_TOP_KEYS_CAPACITY + 1))
+
+        # Recipes only for keys warm-up would replay; rewritten when they change or half their TTL has passed
+        now = time.monotonic()
+        refresh_after = config.CACHE_WARMUP_RECIPE_TTL_SECONDS / 2
+        persisted = {}
+        for key, _ in sketch.most_common(config.CACHE_WARMUP_KEYS):
+            recipe = recipes.get(key)
+            if recipe is None:
+                continue
+            previous = _flushed["recipes"].get(key)
+            if previous is not None and previous[0] == recipe and now - previous[1] < refresh_after:
+                persisted[key] = previous
+                continue
+            pipe.set(RECIPE_KEY.format(key), recipe, ex=config.CACHE_WARMUP_RECIPE_TTL_SECONDS)
+            persisted[key] = (recipe, now)
+
+        await pipe.execute()
+
+    _flushed["counters"] = counters
+    _flushed["histograms"] = snapshots
+    _flushed["top"] = top
+    _flushed["recipes"] = persisted
+
+
+async def get_cluster_metrics():
+    """
+    Metrics summed over every worker, as last flushed to Redis
+    """
+    async with get_redis_client().pipeline(transaction=False) as pipe:
+        pipe.hgetall(COUNTERS_KEY)
+        for name in histograms:
+            pipe.hgetall(HISTOGRAM_KEY.format(name))
+        pipe.zrevrange(TOP_KEYS_KEY, 0, 4, withscores=True)
+        results = await pipe.execute()
+
+    stats = {name: int(results[0].get(name, 0)) for name in COUNTERS}
+    latency = {}
+    for (name, histogram), raw in zip(histograms.items(), results[1:-1]):
+        buckets = [int(raw.get(f"b{index}", 0)) for index in range(len(histogram.buckets))]
+        latency[name] = {
+            **_histogram_summary(histogram.bounds, buckets, float(raw.get("sum", 0)), int(raw.get("count", 0))),
+            "bounds": histogram.bounds,
+            "buckets": buckets,
+        }
+    top_keys = [(key, int(score)) for key, score in results[-1]]
+    summary = _summarize(stats, top_keys, latency)
+    summary["counters"] = stats
+    return summary
+
+
+async def _flush_periodically():
+    while True:
+        await asyncio.sleep(config.METRICS_FLUSH_SECONDS)
+        try:
+            await flush_metrics()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache metrics to Redis: {e}")
+
+
+_flusher_task = None
+
+def start_metrics_flusher():
+    global _flusher_task
+    if _flusher_task is None:
+        _flusher_task = asyncio.create_task(_flush_periodically())
+
+async def stop_metrics_flusher():
+    global _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        try:
+            await _flusher_task
+        except asyncio.CancelledError:
+            pass
+        # Don't lose the last partial interval on shutdown
+        try:
+            await flush_metrics()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache metrics to Redis: {e}")
+    _flusher_task = None
@@ -0,0 +1,43 @@
+from app.cache.metrics import COUNTERS
+
+HELP = {
+    "hits": "Cache hits from any tier",
+    "misses": "Cache misses that ran the endpoint",
+    "local_hits": "Hits served from the in-process L1 tier",
+    "redis_hits": "Hits served from Redis",
+    "coalesced_local": "Misses that joined an in-flight computation in the same worker",
+    "coalesced_remote": "Misses served by waiting on another worker's recompute lock",
+    "lock_wait_timeouts": "Misses that gave up waiting on another worker and recomputed",
+    "stale_hits": "Stale entries served while a background refresh ran",
+    "early_refreshes": "XFetch refreshes started before expiry",
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(cluster: dict) -> str:
+    """
+    Render cluster-wide cache metrics (get_cluster_metrics() output) in the Prometheus text format
+    """
+    lines = []
+    for name in COUNTERS:
+        metric = f"cache_{name}_total"
+        lines += [f"# HELP {metric} {HELP[name]}", f"# TYPE {metric} counter", f"{metric} {cluster['counters'][name]}"]
+
+    for name, histogram in cluster["histograms"].items():
+        metric = f"cache_{name}"
+        lines += [f"# HELP {metric} Cache {name.replace('_', ' ')}", f"# TYPE {metric} histogram"]
+        cumulative = 0
+        for bound, bucket in zip(histogram["bounds"], histogram["buckets"]):
+            cumulative += bucket
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram["count"]}')
+        lines += [f"{metric}_sum {histogram['sum']}", f"{metric}_count {histogram['count']}"]
+
+    lines += ["# HELP cache_key_accesses Approximate accesses of the hottest keys", "# TYPE cache_key_accesses gauge"]
+    for key, count in cluster["top_keys"]:
+        lines.append(f'cache_key_accesses{{key="{_escape(key)}"}} {count}')
+
+    return "\n".join(lines) + "\n"
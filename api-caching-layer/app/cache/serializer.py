@@ -0,0 +1,128 @@
+import json
+import zlib
+from app.core import config
+
+# Optional speedups; each codec is only usable when its package is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Binary payloads start with a header byte: 1fsss ccc (framed, serializer id, compressor id).
+# The high bit is never set on the first byte of the plain JSON text older entries hold.
+HEADER_FLAG = 0x80
+# Framed payloads carry raw bytes after the serialized object: a 4-byte length, the object, then the bytes
+FRAMED_FLAG = 0x40
+
+
+def _json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# name -> (id, dumps, loads)
+SERIALIZERS = {"json": (1, _json_dumps, _json_loads)}
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = (
+        2,
+        lambda obj: msgpack.packb(obj, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+
+# name -> (id, compress, decompress)
+COMPRESSORS = {
+    "none": (0, None, None),
+    "zlib": (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    COMPRESSORS["zstd"] = (2, _zstd_compressor.compress, _zstd_decompressor.decompress)
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = (3, lz4_frame.compress, lz4_frame.decompress)
+
+_SERIALIZERS_BY_ID = {codec[0]: codec for codec in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {codec[0]: codec for codec in COMPRESSORS.values()}
+
+
+def _lookup(table: dict, name: str, kind: str):
+    if name not in table:
+        raise RuntimeError(f"Cache {kind} '{name}' is not available; install its package or pick one of {sorted(table)}")
+    return table[name]
+
+
+def encode(
+    obj,
+    serializer: str | None = None,
+    compression: str | None = None,
+    min_bytes: int | None = None,
+    body: bytes | None = None,
+) -> bytes:
+    """
+    Serialize obj and compress it when it is larger than min_bytes, prefixed with the codec header byte
+    Defaults come from CACHE_SERIALIZER, CACHE_COMPRESSION and CACHE_COMPRESS_MIN_BYTES.
+    body: raw bytes stored after obj as-is (not escaped into it); read back with decode_framed().
+    """
+    serializer_id, dumps, _ = _lookup(SERIALIZERS, serializer or config.CACHE_SERIALIZER, "serializer")
+    compressor_id, compress, _ = _lookup(COMPRESSORS, compression or config.CACHE_COMPRESSION, "compression")
+    min_bytes = config.CACHE_COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+
+    data = dumps(obj)
+    header = HEADER_FLAG | serializer_id << 3
+    if body is not None:
+        data = len(data).to_bytes(4, "big") + data + body
+        header |= FRAMED_FLAG
+    if compress is None or len(data) < min_bytes:
+        compressor_id = 0
+    else:
+        data = compress(data)
+    return bytes([header | compressor_id]) + data
+
+
+def decode_framed(raw: bytes | str) -> tuple:
+    """
+    Decode a cached payload into (obj, body); body is None unless it was written with encode(body=...)
+    Also reads the plain JSON text of older entries.
+    """
+    if isinstance(raw, str) or not raw or raw[0] < HEADER_FLAG:
+        return json.loads(raw), None
+
+    header = raw[0]
+    _, _, loads = _SERIALIZERS_BY_ID[(header >> 3) & 0x07]
+    _, _, decompress = _COMPRESSORS_BY_ID[header & 0x07]
+    data = raw[1:]
+    if decompress is not None:
+        data = decompress(data)
+    if not header & FRAMED_FLAG:
+        return loads(data), None
+    size = int.from_bytes(data[:4], "big")
+    return loads(data[4:4 + size]), bytes(data[4 + size:])
+
+
+def decode(raw: bytes | str):
+    """
+    Decode a cached payload written by encode(), or the plain JSON text of older entries
+    """
+    return decode_framed(raw)[0]
+
+
+# Fail at import time rather than on the first cache write if the configured codec is missing
+_lookup(SERIALIZERS, config.CACHE_SERIALIZER, "serializer")
+_lookup(COMPRESSORS, config.CACHE_COMPRESSION, "compression")
@@ -0,0 +1,22 @@
+import asyncio
+from app.cache.metrics import record_coalesced
+
+# In-flight computations in this process: { cache_key: Task }
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def single_flight(key: str, compute):
+    """
+    Run compute() at most once per key at a time in this process
+    Concurrent callers for the same key await the same task instead of running it again.
+    The task is shielded, so one client disconnecting does not cancel it for the others.
+    """
+    task = _inflight.get(key)
+    if task is not None:
+        record_coalesced("local")
+        return await asyncio.shield(task)
+
+    task = asyncio.ensure_future(compute())
+    _inflight[key] = task
+    task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
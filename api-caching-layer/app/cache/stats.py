@@ -0,0 +1,80 @@
+import heapq
+from bisect import bisect_left
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters sketch: approximate top-k access counts in bounded memory
+    Tracks at most `capacity` keys. A new key replaces the current minimum and inherits
+    its count, so counts may be overestimated by at most that inherited error.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        # Min-heap of (count, key); entries go stale when a count changes and are skipped lazily
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, key: str, amount: int = 1):
+        if key in self.counts:
+            self.counts[key] += amount
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = amount
+            self.errors[key] = 0
+        else:
+            floor, evicted = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[key] = floor + amount
+            self.errors[key] = floor
+
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def most_common(self, n: int):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+def bucket_quantile(bounds: list[float], buckets: list[int], q: float):
+    """
+    Upper bound of the bucket holding the q-th observation (None if empty or in +Inf)
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    rank, seen = q * total, 0
+    for bound, bucket in zip(bounds, buckets):
+        seen += bucket
+        if seen >= rank:
+            return bound
+    return None
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style: `le` upper bounds, the last bucket is +Inf)
+    """
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        return list(self.buckets), self.sum, self.count
+
+    def quantile(self, q: float):
+        return bucket_quantile(self.bounds, self.buckets, q)
@@ -1,5 +1,15 @@
-from app.cache.redis_client import get_redis_client
+from app.cache.backend import get_cache_backend
+from app.cache.local import publish_invalidation
 
-def invalidate_cache(key: str):
-    redis = get_redis_client()
-    redis.delete(key)
+async def invalidate_cache(key: str):
+    await get_cache_backend().delete(key)
+    # Drop the key from every worker's L1 tier as well
+    await publish_invalidation(key)
+
+async def invalidate_tags(*tags: str) -> list[str]:
+    """
+    Invalidate every cached response recorded under any of the given tags
+    """
+    keys = await get_cache_backend().delete_tags(*tags)
+    await publish_invalidation(*keys)
+    return keys
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+import httpx
+from app.core import config
+from app.cache.keys import SENSITIVE_HEADERS
+from app.cache.metrics import cache_stats, recipes as local_recipes, TOP_KEYS_KEY, RECIPE_KEY
+from app.cache.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+warmup_state = {
+    "status": "idle",  # idle | running | done | skipped | failed
+    "total": 0,
+    "completed": 0,
+    "failed": 0,
+    "missing_recipe": 0,
+    "started_at": None,
+    "finished_at": None,
+}
+
+_warmup_task = None
+
+# Sent on replayed requests so they skip this worker's L1 tier and actually refill Redis
+WARMUP_HEADER = "x-cache-warmup"
+
+
+def make_recipe(request, vary: tuple[str, ...] = ()) -> str | None:
+    """
+    Describe how to replay a request so warm-up can rebuild its cache entry
+    Returns None for requests that depend on credentials, which a warm-up must not replay.
+    """
+    if request.method != "GET" or any(name.lower() in SENSITIVE_HEADERS for name in vary):
+        return None
+    headers = {name: request.headers[name] for name in vary if name in request.headers}
+    return json.dumps({"path": request.url.path, "query": request.url.query, "headers": headers})
+
+
+async def _hot_keys(limit: int) -> list[str]:
+    """
+    Hottest keys across workers (shared top-keys set) merged with this worker's own sketch
+    """
+    counts = dict(cache_stats["access_log"].most_common(limit))
+    for key, score in await get_redis_client().zrevrange(TOP_KEYS_KEY, 0, limit - 1, withscores=True):
+        counts[key] = max(counts.get(key, 0), int(score))
+    return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+async def run_warmup(app, limit: int | None = None, concurrency: int | None = None):
+    """
+    Replay the hottest cached requests through the app with bounded concurrency
+    Requests go through cache_response, so keys that are already cached cost one lookup.
+    Only one worker warms at a time; the others mark themselves as skipped.
+    """
+    limit = limit or config.CACHE_WARMUP_KEYS
+    semaphore = asyncio.Semaphore(concurrency or config.CACHE_WARMUP_CONCURRENCY)
+    redis = get_redis_client()
+
+    token = uuid.uuid4().hex
+    if not await redis.set("warmup:lock", token, nx=True, ex=300):
+        warmup_state.update(status="skipped", finished_at=time.time())
+        return warmup_state
+
+    warmup_state.update(
+        status="running", total=0, completed=0, failed=0, missing_recipe=0, started_at=time.time(), finished_at=None
+    )
+    try:
+        keys = await _hot_keys(limit)
+        stored = await redis.mget([RECIPE_KEY.format(key) for key in keys]) if keys else []
+        recipes = []
+        for key, recipe in zip(keys, stored):
+            recipe = recipe or local_recipes.get(key)
+            if recipe:
+                recipes.append(json.loads(recipe))
+            else:
+                warmup_state["missing_recipe"] += 1
+        warmup_state["total"] = len(recipes)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+            async def replay(recipe: dict):
+                async with semaphore:
+                    url = recipe["path"] + (f"?{recipe['query']}" if recipe["query"] else "")
+                    try:
+                        response = await client.get(url, headers={**recipe["headers"], WARMUP_HEADER: "1"})
+                        ok = response.status_code < 400
+                    except Exception as e:
+                        logger.warning(f"Warm-up request {url} failed: {e}")
+                        ok = False
+                    warmup_state["completed" if ok else "failed"] += 1
+
+            await asyncio.gather(*(replay(recipe) for recipe in recipes))
+
+        warmup_state["status"] = "done"
+    except Exception as e:
+        logger.warning(f"Cache warm-up failed: {e}")
+        warmup_state["status"] = "failed"
+    finally:
+        warmup_state["finished_at"] = time.time()
+        await redis.eval(
+            "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0",
+            1, "warmup:lock", token,
+        )
+    return warmup_state
+
+
+def start_warmup(app, limit: int | None = None) -> bool:
+    """
+    Start a warm-up in the background; returns False if one is already running in this worker
+    """
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        return False
+    warmup_state.update(status="running", total=0, completed=0, failed=0, missing_recipe=0, finished_at=None)
+    _warmup_task = asyncio.create_task(run_warmup(app, limit))
+    return True
+
+
+async def stop_warmup():
+    global _warmup_task
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    _warmup_task = None
@@ -0,0 +1,47 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Redis connection
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+
+# Connection pool tuning (shared by every request in the process)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))  # seconds to wait for a free connection
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+# In-process L1 cache in front of Redis (per worker)
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+# Cache stampede protection: Redis lock lease and how long other workers wait for the holder
+CACHE_LOCK_LEASE_SECONDS = float(os.getenv("CACHE_LOCK_LEASE_SECONDS", "5"))
+CACHE_LOCK_WAIT_SECONDS = float(os.getenv("CACHE_LOCK_WAIT_SECONDS", "1"))
+CACHE_LOCK_POLL_SECONDS = float(os.getenv("CACHE_LOCK_POLL_SECONDS", "0.05"))
+
+# Cache keys: global version prefix (bump to rotate every cached entry at once) and hashing threshold
+CACHE_KEY_VERSION = os.getenv("CACHE_KEY_VERSION", "")
+CACHE_KEY_MAX_LENGTH = int(os.getenv("CACHE_KEY_MAX_LENGTH", "200"))
+
+# Tag sets (tag -> cached keys) outlive the entries they point to by at least this long
+CACHE_TAG_TTL_SECONDS = int(os.getenv("CACHE_TAG_TTL_SECONDS", "86400"))
+
+# Cached payload format: serializer ("json" or "msgpack"), compression ("zstd", "lz4", "zlib" or "none")
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "json")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zstd")
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+
+# Metrics: how often each worker flushes its counters to Redis, and how many hot keys to track
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_TOP_KEYS_CAPACITY = int(os.getenv("METRICS_TOP_KEYS_CAPACITY", "1000"))
+
+# Cache warm-up: replay the hottest keys on startup (or via the admin route) with bounded concurrency
+CACHE_WARMUP_ON_STARTUP = os.getenv("CACHE_WARMUP_ON_STARTUP", "true").lower() == "true"
+CACHE_WARMUP_KEYS = int(os.getenv("CACHE_WARMUP_KEYS", "200"))
+CACHE_WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", "8"))
+CACHE_WARMUP_RECIPE_TTL_SECONDS = int(os.getenv("CACHE_WARMUP_RECIPE_TTL_SECONDS", str(7 * 86400)))
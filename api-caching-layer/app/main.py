@@ -1,11 +1,37 @@
 from fastapi import FastAPI
 from app.routers import test, users, posts, cache_admin, metrics
+from app.cache.redis_client import init_redis_pool, close_redis_pool
+from app.cache.local import start_invalidation_listener, stop_invalidation_listener
+from app.cache.metrics import start_metrics_flusher, stop_metrics_flusher
+from app.cache.warmup import start_warmup, stop_warmup
+from app.core import config
 
 app = FastAPI()
 
 
+@app.on_event("startup")
+async def startup():
+    # Open the shared Redis connection pool once per process
+    init_redis_pool()
+    # Keep this worker's L1 cache in sync with invalidations from other workers
+    start_invalidation_listener()
+    # Periodically push this worker's cache metrics to Redis for cluster-wide totals
+    start_metrics_flusher()
+    # Rebuild the hottest cache entries in the background so this worker doesn't start cold
+    if config.CACHE_WARMUP_ON_STARTUP:
+        start_warmup(app)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_warmup()
+    await stop_invalidation_listener()
+    await stop_metrics_flusher()
+    await close_redis_pool()
+
+
 app.include_router(test.router)
 app.include_router(users.router, prefix="/api", tags=["users"])
 app.include_router(posts.router, prefix="/api", tags=["posts"])
 app.include_router(cache_admin.router, prefix="/api/admin", tags=["cache_admin"])
-app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
\ No newline at end of file
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
@@ -1,9 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from app.cache.redis_client import get_redis_client
+from app.cache.local import publish_invalidation
+from app.cache.utils import invalidate_tags
+from app.cache.warmup import start_warmup, warmup_state
 
 router = APIRouter()
 
-@router.delete("/invalidate/{key}")
-def invalidate_cache_key(key: str, redis = Depends(get_redis_client)):
-    deleted = redis.delete(key)
+@router.delete("/invalidate/{key:path}")
+async def invalidate_cache_key(key: str, redis = Depends(get_redis_client)):
+    deleted = await redis.delete(key)
+    await publish_invalidation(key)
     return {"key": key, "deleted": bool(deleted)}
+
+
+@router.delete("/invalidate-tags")
+async def invalidate_cache_tags(tag: list[str] = Query(...)):
+    """
+    DELETE every cached response recorded under any of the given tags (?tag=posts&tag=user:1)
+    """
+    keys = await invalidate_tags(*tag)
+    return {"tags": tag, "deleted": len(keys), "keys": keys}
+
+
+@router.post("/warmup")
+async def trigger_warmup(request: Request, limit: int | None = Query(None, ge=1, le=10000)):
+    """
+    POST to replay the hottest cached requests in the background (e.g. after a deploy or Redis flush)
+    """
+    if not start_warmup(request.app, limit):
+        raise HTTPException(status_code=409, detail="Warm-up already running")
+    return {"message": "Warm-up started", "progress": warmup_state}
+
+
+@router.get("/warmup")
+async def warmup_progress():
+    """
+    GET progress of the current or last warm-up run
+    """
+    return warmup_state
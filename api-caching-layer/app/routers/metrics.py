@@ -1,15 +1,42 @@
-from fastapi import APIRouter
-from app.cache.metrics import get_metrics
-from app.cache.redis_client import get_redis_client
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+from app.cache.metrics import get_metrics, get_cluster_metrics, flush_metrics
+from app.cache.keyspace import count_keys, sample_keyspace
+from app.cache.prometheus import render_prometheus
+from app.cache.redis_client import get_pool_stats
 
 router = APIRouter()
 
 @router.get("/metrics/cache")
-def cache_metrics():
+async def cache_metrics(sample: int = Query(0, ge=0, le=10000)):
     """
-    GET cache metrics including total cached keys
+    GET cache metrics including the total number of keys in Redis
+    - sample: if > 0, SCAN this many keys to estimate counts and memory per key family,
+      and how many of the keys are cached responses (estimated_cached_keys)
+    Top-level numbers are summed over all workers; "worker" holds this worker's own view.
     """
-    metrics = get_metrics()
-    redis = get_redis_client()
-    metrics["total_cached_keys"] = len(redis.keys("*"))
+    await flush_metrics()
+    metrics = await get_cluster_metrics()
+    metrics["worker"] = get_metrics()
+    metrics["total_keys"] = await count_keys()
+    if sample:
+        metrics["keyspace"] = await sample_keyspace(sample, metrics["total_keys"])
+    metrics["connection_pool"] = get_pool_stats()
     return metrics
+
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    GET cluster-wide cache metrics in the Prometheus text format
+    """
+    await flush_metrics()
+    return PlainTextResponse(render_prometheus(await get_cluster_metrics()), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/pool")
+async def pool_metrics():
+    """
+    GET Redis connection pool saturation (in use, idle, wait time)
+    """
+    return get_pool_stats()
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, Request
 from app.cache.redis_client import get_redis_client
 from app.cache.decorator import cache_response
-from app.cache.utils import invalidate_cache
+from app.cache.utils import invalidate_tags
 
 router = APIRouter()
 
 @router.get("/posts/")
-@cache_response(ttl=90) # use custom cache decorator with a TTL of 90 seconds
+@cache_response(ttl=90, local_ttl=10, stale_ttl=30, xfetch_beta=1.0, tags=["posts"]) # 90s fresh (+30s stale) in Redis, 10s in L1
 async def get_posts(request: Request, redis = Depends(get_redis_client)):
     """
     GET posts and cache the response
@@ -17,8 +17,8 @@ async def get_posts(request: Request, redis = Depends(get_redis_client)):
 @router.post("/posts/")
 async def create_post(request: Request, redis = Depends(get_redis_client)):
     """
-    POST to create a new post and invalidate the cache for posts
+    POST to create a new post and invalidate every cached posts response
     """
     # Simulate new post creation
-    invalidate_cache("GET:/posts/")
+    await invalidate_tags("posts")
     return {"status": "created"}
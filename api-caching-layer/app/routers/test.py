@@ -4,6 +4,6 @@ from app.cache.redis_client import get_redis_client
 router = APIRouter()
 
 @router.get("/redis-test")
-def redis_test(redis = Depends(get_redis_client)):
-    redis.set("test_key", "hello")
-    return {"cached_value": redis.get("test_key")}
\ No newline at end of file
+async def redis_test(redis = Depends(get_redis_client)):
+    await redis.set("test_key", "hello")
+    return {"cached_value": await redis.get("test_key")}
\ No newline at end of file
@@ -6,7 +6,7 @@ from app.cache.decorator import cache_response
 router = APIRouter()
 
 @router.get("/users/{user_id}")
-@cache_response(ttl=120) # use custom cache decorator with a TTL of 120 seconds
+@cache_response(ttl=120, stale_ttl=60, xfetch_beta=1.0, tags=["users", "user:{user_id}"]) # 120s fresh, then served stale for 60s while refreshing
 async def get_user(user_id: int, request: Request, redis = Depends(get_redis_client)):
     """
     GET user details and cache the response
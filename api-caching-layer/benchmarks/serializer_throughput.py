@@ -0,0 +1,75 @@
+"""
+Benchmark: encode/decode throughput and stored bytes for each cache payload codec
+
+"legacy" is the old format (json.dumps text, json.loads on every hit).
+Every other row goes through app.cache.serializer with compression above CACHE_COMPRESS_MIN_BYTES.
+Codecs whose package is not installed are skipped. No Redis needed.
+
+Usage (from api-caching-layer/):
+    python -m benchmarks.serializer_throughput
+"""
+import json
+import random
+import time
+
+from app.cache.serializer import SERIALIZERS, COMPRESSORS, encode, decode
+
+WORDS = (
+    "cache redis latency worker request response token header payload cluster shard replica "
+    "python fastapi async event loop queue metrics deploy rollout service endpoint client"
+).split()
+
+
+def make_posts(count: int, seed: int = 7) -> dict:
+    """
+    A list response shaped like GET /api/posts/ with varied (not repeated) text
+    """
+    rng = random.Random(seed)
+    sentence = lambda n: " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+    return {
+        "posts": [
+            {
+                "id": i,
+                "title": sentence(6),
+                "body": sentence(60),
+                "author": {"id": rng.randint(1, 500), "name": sentence(2)},
+                "tags": rng.sample(WORDS, 3),
+                "likes": rng.randint(0, 10_000),
+                "published": rng.random() > 0.2,
+            }
+            for i in range(count)
+        ],
+        "total": count,
+    }
+
+
+def ops_per_second(fn, arg, min_time: float = 0.3) -> float:
+    runs, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time:
+        fn(arg)
+        runs += 1
+    return runs / elapsed
+
+
+def main():
+    codecs = [("legacy", lambda obj: json.dumps(obj).encode(), json.loads)]
+    for serializer in SERIALIZERS:
+        for compression in COMPRESSORS:
+            codecs.append((
+                f"{serializer}+{compression}",
+                lambda obj, s=serializer, c=compression: encode(obj, s, c),
+                decode,
+            ))
+
+    for label, count in (("user", 1), ("10 posts", 10), ("100 posts", 100), ("2000 posts", 2000)):
+        payload = {"user_id": 1, "name": "Cached User"} if count == 1 else make_posts(count)
+        print(f"\n{label}")
+        print(f"  {'codec':<16}{'bytes':>10}{'encode/s':>12}{'decode/s':>12}")
+        for name, enc, dec in codecs:
+            blob = enc(payload)
+            assert dec(blob) == payload
+            print(f"  {name:<16}{len(blob):>10}{ops_per_second(enc, payload):>12.0f}{ops_per_second(dec, blob):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
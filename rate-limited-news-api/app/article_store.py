@@ -0,0 +1,171 @@
+import os
+import time
+import base64
+import asyncio
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Persistent article history (SQLite; one file, no server)
+ARTICLE_DB_PATH = os.getenv("ARTICLE_DB_PATH", "articles.db")
+
+# Query parameters that only track the click, not the article
+TRACKING_PARAMS = {"fbclid", "gclid", "ocid", "at_medium", "at_campaign", "ref", "ref_src"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id           TEXT PRIMARY KEY,   -- hash of the normalized URL
+    source       TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    published_at TEXT,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_first_seen ON articles (source, first_seen, id);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles (first_seen, id);
+"""
+
+UPSERT = """
+INSERT INTO articles (id, source, title, url, published_at, first_seen, last_seen)
+VALUES (:id, :source, :title, :url, :published_at, :now, :now)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title,
+    last_seen = excluded.last_seen
+"""
+
+_conn: sqlite3.Connection | None = None
+# sqlite3 connections are not safe to share between threads; one worker serializes all access
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="article-store")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form used for dedupe: lowercase scheme/host, no fragment,
+    no tracking parameters, remaining query parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in TRACKING_PARAMS and not k.startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def article_id(url: str) -> str:
+    """
+    Stable article ID: the same story gets the same ID across scrapes and restarts
+    """
+    return hashlib.blake2b(normalize_url(url).encode(), digest_size=12).hexdigest()
+
+
+def encode_cursor(first_seen: float, id: str) -> str:
+    return base64.urlsafe_b64encode(f"{first_seen!r}|{id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """
+    Raises ValueError for anything that is not a cursor we handed out
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        first_seen, id = raw.split("|", 1)
+        return float(first_seen), id
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def _open():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(ARTICLE_DB_PATH, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        # WAL: readers do not block the scraper's writes
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.executescript(SCHEMA)
+
+
+def _close():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+    _conn = None
+
+
+# Spacing between first_seen values within one batch (see _upsert)
+BATCH_POSITION_STEP = 1e-6
+
+
+def _upsert(articles: List[Dict], now: float):
+    _open()
+    with _conn:
+        _conn.executemany(UPSERT, [
+            {
+                "id": article.get("id") or article_id(article["url"]),
+                "source": article["source"],
+                "title": article["title"],
+                "url": article["url"],
+                "published_at": article.get("published_at"),
+                # Articles from one scrape would all share `now`; step each one back a microsecond
+                # so newest-first keeps the order they had on the page
+                "now": now - i * BATCH_POSITION_STEP,
+            }
+            for i, article in enumerate(articles)
+        ])
+
+
+def _page(source: str | None, limit: int, after: tuple[float, str] | None) -> List[Dict]:
+    _open()
+    where, params = [], []
+    if source:
+        where.append("source = ?")
+        params.append(source)
+    if after:
+        # Row-value comparison walks the (source, first_seen, id) index from the cursor on
+        where.append("(first_seen, id) < (?, ?)")
+        params.extend(after)
+    sql = "SELECT id, source, title, url, published_at, first_seen, last_seen FROM articles"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY first_seen DESC, id DESC LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in _conn.execute(sql, params)]
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+async def open_article_store():
+    await _run(_open)
+
+
+async def close_article_store():
+    await _run(_close)
+
+
+async def upsert_articles(articles: List[Dict]):
+    """
+    Insert new articles, refresh title / last_seen for ones already stored
+    """
+    if articles:
+        await _run(_upsert, articles, time.time())
+
+
+async def get_articles_page(source: str | None = None, limit: int = 10, cursor: str | None = None) -> Dict:
+    """
+    Newest-first page of stored articles, optionally for one source
+    Keyset pagination: cost does not grow with depth, and rows inserted by a
+    scrape while a client is paging do not shift later pages.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    rows = await _run(_page, source, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["first_seen"], rows[-1]["id"])
+    return {"results": rows, "next_cursor": next_cursor}
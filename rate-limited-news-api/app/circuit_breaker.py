@@ -0,0 +1,85 @@
+import random
+import time
+from typing import Dict
+
+# Consecutive failures before a source's circuit opens
+FAILURE_THRESHOLD = 3
+# Open for base_backoff * 2^(trips - 1), capped, +/-20% jitter. Sources pass
+# BACKOFF_INTERVALS refresh intervals as their base, so even the first trip
+# (at worst 0.8 * 2 intervals) outlasts the next scheduled run (at most 1.1 intervals).
+BACKOFF_INTERVALS = 2
+BASE_BACKOFF_SECONDS = 90.0  # for breakers created without a source interval
+MAX_BACKOFF_SECONDS = 600.0
+JITTER = 0.2
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-source breaker: after FAILURE_THRESHOLD failures in a row the source is not
+    contacted until its backoff elapses; then one probe is let through (half-open).
+    A successful probe closes the circuit, a failed one reopens it with a doubled backoff.
+    """
+
+    def __init__(self, name: str, base_backoff: float = BASE_BACKOFF_SECONDS):
+        self.name = name
+        self.base_backoff = base_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0              # consecutive times the circuit opened without recovering
+        self.opened_until = 0.0
+        self.last_failure: str | None = None
+        self.probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.time() >= self.opened_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.probe_in_flight = False
+
+    def record_failure(self, reason: str):
+        self.failures += 1
+        self.last_failure = reason
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= FAILURE_THRESHOLD:
+            self.trips += 1
+            backoff = min(MAX_BACKOFF_SECONDS, self.base_backoff * 2 ** (self.trips - 1))
+            self.opened_until = time.time() + backoff * random.uniform(1 - JITTER, 1 + JITTER)
+            self.state = OPEN
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_at": self.opened_until if self.state != CLOSED else None,
+            "last_failure": self.last_failure,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, interval: float | None = None) -> CircuitBreaker:
+    """
+    The breaker for a source, created on first use; `interval` is the source's refresh interval
+    """
+    if name not in _breakers:
+        base_backoff = BACKOFF_INTERVALS * interval if interval else BASE_BACKOFF_SECONDS
+        _breakers[name] = CircuitBreaker(name, base_backoff)
+    return _breakers[name]
+
+
+def get_breaker_states() -> Dict[str, Dict]:
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
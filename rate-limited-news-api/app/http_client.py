@@ -0,0 +1,89 @@
+from collections import defaultdict
+import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# Connection limits for the shared scraper client
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120.0  # longer than the scrape interval so connections survive between cycles
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+_client: httpx.AsyncClient | None = None
+
+# Per-host request stats: { host: {"requests", "errors", "not_modified", "total_ms"} }
+_host_stats = defaultdict(lambda: {"requests": 0, "errors": 0, "not_modified": 0, "total_ms": 0.0})
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the app-lifetime client (called from create_app() on startup)
+    One pool means TCP/TLS sessions and HTTP/2 connections are reused across scrapes.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it lazily if startup has not run (e.g. in scripts)
+    """
+    return _client or create_http_client()
+
+
+def record_request(host: str, elapsed: float, ok: bool, not_modified: bool = False):
+    stats = _host_stats[host]
+    stats["requests"] += 1
+    stats["total_ms"] += elapsed * 1000
+    if not ok:
+        stats["errors"] += 1
+    if not_modified:
+        stats["not_modified"] += 1
+
+
+def get_pool_stats():
+    """
+    Per-host connection pool state (open / idle / active / HTTP/2) plus request latency
+    """
+    hosts = defaultdict(lambda: {"connections": 0, "idle": 0, "active": 0, "http2": 0})
+    if _client is not None:
+        # httpx does not expose its pool publicly; read the httpcore connections behind it
+        for connection in _client._transport._pool.connections:
+            host = connection._origin.host.decode()
+            entry = hosts[host]
+            entry["connections"] += 1
+            entry["idle" if connection.is_idle() else "active"] += 1
+            if connection.info().startswith("HTTP/2"):
+                entry["http2"] += 1
+
+    for host, stats in _host_stats.items():
+        entry = hosts[host]
+        entry["requests"] = stats["requests"]
+        entry["errors"] = stats["errors"]
+        entry["not_modified"] = stats["not_modified"]
+        entry["avg_ms"] = round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else None
+
+    return {"http2_enabled": HTTP2_ENABLED, "hosts": dict(hosts)}
@@ -1,8 +1,131 @@
+import os
+import sys
+import json
+import uuid
+import queue
+import atexit
+import random
 import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
+# LOG_FORMAT=json (default) for one JSON object per line, text for the old human-readable lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Share of high-volume lines (e.g. cache hits) that are kept; see SamplingFilter
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+LOG_QUEUE_SIZE = 10_000
 
+REQUEST_ID_HEADER = "X-Request-ID"
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamp records with the current request id; runs on the caller's side of the queue,
+    where the context variable is visible
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a share of records that opt in with extra={"sample_rate": rate}
+    Drops happen before the message is formatted, so sampled-out lines cost almost nothing.
+    """
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DropWhenFullQueueHandler(logging.handlers.QueueHandler):
+    """
+    Never block the event loop on logging: if the writer thread falls behind, drop the line
+    """
+
+    def prepare(self, record):
+        # Resolve the message (args may not be safe to read from another thread) but leave
+        # all other formatting to the listener; the record is not shared with other handlers
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Root logger -> bounded queue -> listener thread -> stdout
+    Callers only pay for filtering and enqueueing; formatting and I/O happen on the listener thread.
+    """
+    stream = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = DropWhenFullQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # flush what is queued on shutdown
+    return listener
+
+
+async def add_request_id(request, call_next):
+    """
+    HTTP middleware: reuse the caller's X-Request-ID or mint one, expose it to every
+    log line of the request, and echo it on the response
+    """
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+listener = setup_logging()
 logger = logging.getLogger("news-api")
@@ -1,14 +1,42 @@
 from fastapi import FastAPI
-from .rate_limit import limiter, rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from .rate_limit import RateLimitExceeded, rate_limit_exceeded_handler, add_rate_limit_headers
+from .logger import add_request_id
 from .routers import news, status
+from .http_client import create_http_client, close_http_client
+from .parsers import create_parse_pool, close_parse_pool
+from .scheduler import start_scheduler, stop_scheduler
+from .article_store import open_article_store, close_article_store
+from .scraper import SCRAPE_JOBS
 
 def create_app():
     app = FastAPI()
 
-    # Attach limiter + exception handler
-    app.state.limiter = limiter
+    # Redis-backed limiter: 429 handler + X-RateLimit-* headers on allowed responses
     app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.middleware("http")(add_rate_limit_headers)
+
+    # Request ids for log lines (outermost, so everything below logs with it)
+    app.middleware("http")(add_request_id)
+
+    # One pooled HTTP client for all scrapes, opened and closed with the app
+    app.add_event_handler("startup", create_http_client)
+    app.add_event_handler("shutdown", close_http_client)
+
+    # Bounded pool that keeps HTML parsing off the event loop
+    app.add_event_handler("startup", create_parse_pool)
+    app.add_event_handler("shutdown", close_parse_pool)
+
+    # Persistent article history behind /news/with_pagination
+    app.add_event_handler("startup", open_article_store)
+    app.add_event_handler("shutdown", close_article_store)
+
+    # Background refresh: scrapers run on their own interval, /news only reads the cache
+    async def start_background_scraping():
+        await start_scheduler(SCRAPE_JOBS)
+
+    app.add_event_handler("startup", start_background_scraping)
+    # Stop the scheduler first on shutdown, before the client and parse pool it uses are closed
+    app.router.on_shutdown.insert(0, stop_scheduler)
 
     # Register routes 
     app.include_router(news.router)
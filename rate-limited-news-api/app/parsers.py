@@ -0,0 +1,93 @@
+import os
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from app.sources import Source
+from app.article_store import article_id
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Parser backend: "selectolax", "lxml" (BeautifulSoup on lxml) or "html.parser" (pure Python)
+# Defaults to the fastest one installed
+DEFAULT_BACKEND = "selectolax" if SELECTOLAX_AVAILABLE else "lxml" if LXML_AVAILABLE else "html.parser"
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", DEFAULT_BACKEND)
+
+# Upper bound on parse workers; html.parser holds the GIL so it gets processes,
+# the C parsers get threads (no pickling of the page, most of the work is in C)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+
+_executor: Executor | None = None
+
+
+def select_links(html: str, selector: str, backend: str = PARSER_BACKEND) -> List[tuple[str, str | None]]:
+    """
+    Return (text, href) for every element matching a CSS selector, using the chosen backend
+    """
+    if backend == "selectolax":
+        tree = LexborHTMLParser(html)
+        return [(node.text(strip=True), node.attributes.get("href")) for node in tree.css(selector)]
+
+    soup = BeautifulSoup(html, "lxml" if backend == "lxml" else "html.parser")
+    return [(tag.get_text(strip=True), tag.get("href")) for tag in soup.select(selector)]
+
+
+def parse_source(source: Source, html: str, backend: str = PARSER_BACKEND) -> List[Dict]:
+    """
+    Extract article dicts for a source: select its links, normalize URLs, keep the first `limit`
+    """
+    articles = []
+    for title, url in select_links(html, source.link_selector, backend):
+        if not url:
+            continue
+        url = urljoin(source.base_url, url) if source.base_url else url
+        articles.append({
+            "id": article_id(url),
+            "source": source.article_label,
+            "title": title,
+            "url": url,
+            "published_at": None  # none of the listing pages give this directly
+        })
+        if len(articles) >= source.limit:
+            break
+    return articles
+
+
+def create_parse_pool() -> Executor:
+    """
+    Create the bounded parse pool (called from create_app() on startup)
+    """
+    global _executor
+    if _executor is None:
+        if PARSER_BACKEND == "html.parser":
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+    return _executor
+
+
+def close_parse_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+async def parse_articles(source: Source, html: str) -> List[Dict]:
+    """
+    Parse a fetched page off the event loop and return only the extracted article dicts
+    """
+    loop = asyncio.get_running_loop()
+    executor = _executor or create_parse_pool()
+    return await loop.run_in_executor(executor, parse_source, source, html, PARSER_BACKEND)
@@ -1,15 +1,206 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import time
+import functools
+from dataclasses import dataclass
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+from app.logger import logger
+from app.redis_cache import redis_client
+from app.rate_limit_policy import Rate, policies
 
-limiter = Limiter(key_func=get_remote_address)
+# Local fast path: a hot client reserves a slice of its quota from Redis in one call
+# and spends it in-process. Reservations lapse after LOCAL_LEASE_SECONDS, which bounds
+# how far a burst can run ahead of the shared limit; whatever was not spent is handed
+# back to Redis on the client's next call. Only clients that reach Redis LOCAL_HOT_HITS
+# times within one lease reserve at all, so a steady trickle never holds quota it won't use.
+LOCAL_BATCH_FRACTION = 0.05   # reserve up to 5% of the limit at a time...
+LOCAL_BATCH_MAX = 50          # ...but never more than this
+LOCAL_LEASE_SECONDS = 1.0
+LOCAL_HOT_HITS = 3
+LOCAL_MAX_KEYS = 10_000       # prune expired reservations / blocks beyond this many clients
+
+# GCRA (generic cell rate algorithm): one key per client holding its "theoretical arrival time".
+# First gives back ARGV[5] unspent reserved units, then grants ARGV[4] units or nothing (a route's cost),
+# plus up to ARGV[3] in total as a reservation, and returns {granted, remaining, retry_after_ms, reset_ms}.
+# Uses the Redis clock so every worker agrees.
+GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local needed = tonumber(ARGV[4])
+local refund = tonumber(ARGV[5])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local window = emission * limit
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+tat = math.max(now, tat - refund * emission)
+
+local available = math.floor((window - (tat - now)) / emission)
+if available < needed then
+    if refund > 0 then
+        redis.call('SET', KEYS[1], tat, 'PX', math.max(1, math.ceil(tat - now)))
+    end
+    return {0, math.max(available, 0), tat - window + needed * emission - now, tat - now}
+end
+
+local granted = math.min(requested, available)
+tat = tat + granted * emission
+redis.call('SET', KEYS[1], tat, 'PX', math.max(1, math.ceil(tat - now)))
+return {granted, available - granted, 0, tat - now}
+"""
+
+
+@dataclass
+class RateLimitInfo:
+    limit: int
+    remaining: int
+    reset_after: float       # seconds until the full quota is available again
+    retry_after: float = 0.0
+
+    def headers(self) -> dict:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(0, self.remaining)),
+            "X-RateLimit-Reset": str(max(0, round(self.reset_after))),
+        }
+        if self.retry_after:
+            headers["Retry-After"] = str(max(1, round(self.retry_after + 0.5)))
+        return headers
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, info: RateLimitInfo):
+        super().__init__(f"Rate limit exceeded, retry after {info.retry_after:.1f}s")
+        self.info = info
+
+
+class RateLimiter:
+    """
+    Redis-backed limiter shared by every worker and pod
+    One EVALSHA per request at most; hot clients are mostly answered from local reservations.
+    """
+
+    def __init__(self, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        self.script = redis_client.register_script(GCRA_SCRIPT)
+        # { redis key: [tokens, lease_expires, remaining_hint, reset_at] }
+        self._local = {}
+        # { redis key: (monotonic time until which Redis keeps refusing, cost that was refused) }
+        self._blocked = {}
+        # { redis key: [start of the current lease-long window, calls to Redis in it] }
+        self._recent = {}
+
+    def prune(self, now: float):
+        # Unspent tokens of lapsed reservations dropped here stay charged until the bucket refills
+        self._local = {k: v for k, v in self._local.items() if v[1] > now}
+        self._blocked = {k: v for k, v in self._blocked.items() if v[0] > now}
+        self._recent = {k: v for k, v in self._recent.items() if now - v[0] <= LOCAL_LEASE_SECONDS}
+
+    def batch_size(self, rate: Rate) -> int:
+        return max(1, min(LOCAL_BATCH_MAX, int(rate.limit * LOCAL_BATCH_FRACTION)))
+
+    async def hit(self, key: str, rate: Rate, cost: int = 1) -> RateLimitInfo:
+        """
+        Charge `cost` units to `key` under `rate`; raises RateLimitExceeded when over
+        """
+        redis_key = f"{self.prefix}:{key}"
+        now = time.monotonic()
+        if len(self._local) + len(self._blocked) + len(self._recent) > LOCAL_MAX_KEYS:
+            self.prune(now)
+
+        blocked_until = self._blocked.get(redis_key)
+        if blocked_until is not None:
+            if now < blocked_until[0] and cost >= blocked_until[1]:
+                wait = blocked_until[0] - now
+                raise RateLimitExceeded(RateLimitInfo(rate.limit, 0, wait, wait))
+            del self._blocked[redis_key]
+
+        local = self._local.get(redis_key)
+        if local is not None and local[0] >= cost and now < local[1]:
+            local[0] -= cost
+            return RateLimitInfo(rate.limit, local[0] + local[2], local[3] - now)
+
+        # Going to Redis: hand back what is left of a lapsed or too-small reservation
+        local = self._local.pop(redis_key, None)
+        refund = local[0] if local is not None else 0
+
+        recent = self._recent.get(redis_key)
+        if recent is None or now - recent[0] > LOCAL_LEASE_SECONDS:
+            recent = self._recent[redis_key] = [now, 0]
+        recent[1] += 1
+        requested = max(cost, self.batch_size(rate)) if recent[1] >= LOCAL_HOT_HITS else cost
+
+        emission_ms = rate.period * 1000 / rate.limit
+        try:
+            granted, remaining, retry_after_ms, reset_ms = await self.script(
+                keys=[redis_key], args=[emission_ms, rate.limit, requested, cost, refund]
+            )
+        except RedisError as e:
+            if local is not None:
+                self._local[redis_key] = local  # not handed back; keep it for the next attempt
+            # Fail open: an unreachable Redis must not take the API down with it
+            logger.error("Rate limiter unavailable, allowing request: %r", e)
+            return RateLimitInfo(rate.limit, rate.limit, 0)
+
+        if granted < cost:
+            retry_after = int(retry_after_ms) / 1000
+            # Anything costing at least this much is refused until then
+            self._blocked[redis_key] = (now + retry_after, cost)
+            raise RateLimitExceeded(RateLimitInfo(rate.limit, int(remaining), int(reset_ms) / 1000, retry_after))
+
+        reset_at = now + int(reset_ms) / 1000
+        if granted > cost:
+            self._local[redis_key] = [granted - cost, now + LOCAL_LEASE_SECONDS, int(remaining), reset_at]
+        return RateLimitInfo(rate.limit, int(remaining) + granted - cost, reset_at - now)
+
+    def limit(self, cost: int = 1):
+        """
+        Route decorator, e.g. @limiter.limit(cost=10); the route must take a `request: Request`
+        The client's tier (by X-API-Key, else per IP) sets the rate; `cost` is the default
+        charge for the route, overridable per route name in the policy config.
+        Headers for the response are left on request.state for add_rate_limit_headers.
+        """
+        def decorator(func):
+            route = func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if not isinstance(request, Request):
+                    raise TypeError(f"{route} needs a `request: Request` parameter to be rate limited")
+                policy = policies.current()
+                client = policy.resolve(request)
+                rate = policy.tiers[client.tier]
+                request.state.rate_limit = await self.hit(
+                    f"{client.tier}:{client.identity}", rate, policy.cost(route, cost)
+                )
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+limiter = RateLimiter()
+
+
+async def add_rate_limit_headers(request: Request, call_next):
+    """
+    HTTP middleware: copy X-RateLimit-* onto successful responses of limited routes
+    """
+    response = await call_next(request)
+    info = getattr(request.state, "rate_limit", None)
+    if info is not None:
+        response.headers.update(info.headers())
+    return response
 
 
 # Custom handler
 async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
         status_code=429,
-        content={"detail": "Rate limit exceeded. Too many requests from this IP. Try again later."},
-    )
\ No newline at end of file
+        content={"detail": "Rate limit exceeded. Too many requests for your API key or IP. Try again later."},
+        headers=exc.info.headers(),
+    )
@@ -0,0 +1,171 @@
+import os
+import re
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+from fastapi import HTTPException, Request, status
+from app.logger import logger
+
+RATE_LIMIT_CONFIG = Path(os.getenv("RATE_LIMIT_CONFIG", Path(__file__).resolve().parent.parent / "rate_limits.json"))
+RELOAD_CHECK_SECONDS = 5.0  # how often the config file's mtime is checked
+API_KEY_HEADER = "X-API-Key"
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Used when the config file is missing: the old behaviour, /news/ at 3/minute per IP
+DEFAULT_CONFIG = {
+    "default_tier": "anonymous",
+    "tiers": {"anonymous": {"rate": "30/minute"}},
+    "api_keys": {},
+    "route_costs": {"news_endpoint": 10},
+}
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: int  # seconds
+
+    @classmethod
+    def parse(cls, rate: str) -> "Rate":
+        """
+        "3/minute", "100 per second", "10/2 hours"
+        """
+        match = re.fullmatch(r"\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*", rate)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {rate!r}")
+        count, multiplier, unit = match.groups()
+        limit, period = int(count), int(multiplier or 1) * PERIODS[unit]
+        if limit <= 0 or period <= 0:
+            raise ValueError(f"Rate limit must allow at least one unit per period: {rate!r}")
+        return cls(limit, period)
+
+    def __str__(self):
+        return f"{self.limit}/{self.period}s"
+
+
+def _expect(value, kind: type, what: str):
+    """
+    Raise ValueError (rather than an AttributeError later on) for a config value of the wrong shape
+    """
+    if not isinstance(value, kind):
+        raise ValueError(f"{what} must be a {'mapping' if kind is dict else kind.__name__}, got {type(value).__name__}")
+    return value
+
+
+@dataclass(frozen=True)
+class Client:
+    identity: str   # quota bucket: "tenant:<name>" for API keys, "ip:<address>" otherwise
+    tier: str
+
+
+@dataclass
+class Policy:
+    """
+    Tiers (a rate in cost units), API key -> tenant/tier, and the cost of each route
+    Tenants share one quota across all their keys and all routes.
+    """
+    default_tier: str
+    tiers: Dict[str, Rate]
+    api_keys: Dict[str, Dict[str, str]]
+    route_costs: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Policy":
+        """
+        Raises ValueError for anything that would fail later on a request
+        """
+        _expect(config, dict, "rate limit config")
+        tiers = {}
+        for name, tier in _expect(config.get("tiers"), dict, "tiers").items():
+            rate = _expect(tier, dict, f"tier {name!r}").get("rate")
+            tiers[name] = Rate.parse(_expect(rate, str, f"rate of tier {name!r}"))
+
+        default_tier = config.get("default_tier", "anonymous")
+        if default_tier not in tiers:
+            raise ValueError(f"default_tier {default_tier!r} is not defined")
+
+        api_keys = _expect(config.get("api_keys", {}), dict, "api_keys")
+        for key, entry in api_keys.items():
+            _expect(entry, dict, f"API key ...{key[-4:]}")
+            if entry.get("tier") not in tiers:
+                raise ValueError(f"API key ...{key[-4:]} uses unknown tier {entry.get('tier')!r}")
+            _expect(entry.get("tenant", key), str, f"tenant of API key ...{key[-4:]}")
+
+        route_costs = {}
+        for route, cost in _expect(config.get("route_costs", {}), dict, "route_costs").items():
+            if isinstance(cost, bool) or not isinstance(cost, int) or cost < 0:
+                raise ValueError(f"cost of route {route!r} must be a non-negative integer, got {cost!r}")
+            route_costs[route] = cost
+        return cls(default_tier, tiers, api_keys, route_costs)
+
+    def resolve(self, request: Request) -> Client:
+        api_key = request.headers.get(API_KEY_HEADER)
+        if api_key is None:
+            address = request.client.host if request.client else "127.0.0.1"
+            return Client(f"ip:{address}", self.default_tier)
+        entry = self.api_keys.get(api_key)
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return Client(f"tenant:{entry.get('tenant', api_key)}", entry["tier"])
+
+    def cost(self, route: str, default: int) -> int:
+        return self.route_costs.get(route, default)
+
+
+class PolicyStore:
+    """
+    Holds the current Policy and reloads it when the config file changes
+    A broken config is logged and ignored; the last good policy stays in force.
+    """
+
+    def __init__(self, path: Path = RATE_LIMIT_CONFIG):
+        self.path = path
+        self.policy = Policy.from_config(DEFAULT_CONFIG)
+        self.loaded_mtime: float | None = None
+        self.loaded_at: float | None = None
+        self.next_check = 0.0
+        self.reload()
+
+    def reload(self) -> bool:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            if self.loaded_mtime is None and self.loaded_at is None:
+                logger.warning("No rate limit config at %s; using built-in defaults", self.path)
+                self.loaded_at = time.time()
+            return False
+        if mtime == self.loaded_mtime:
+            return False
+        try:
+            self.policy = Policy.from_config(json.loads(self.path.read_text()))
+        except Exception as e:
+            # Whatever is wrong with the file, requests keep being limited by the last good policy
+            logger.error("Ignoring invalid rate limit config %s: %r", self.path, e)
+            self.loaded_mtime = mtime  # don't re-parse the same broken file every check
+            return False
+        self.loaded_mtime = mtime
+        self.loaded_at = time.time()
+        logger.info("Loaded rate limit policy from %s (%d tiers)", self.path, len(self.policy.tiers))
+        return True
+
+    def current(self) -> Policy:
+        now = time.monotonic()
+        if now >= self.next_check:
+            self.next_check = now + RELOAD_CHECK_SECONDS
+            self.reload()
+        return self.policy
+
+    def describe(self) -> dict:
+        return {
+            "config": str(self.path),
+            "loaded_at": self.loaded_at,
+            "default_tier": self.policy.default_tier,
+            "tiers": {name: str(rate) for name, rate in self.policy.tiers.items()},
+            "route_costs": self.policy.route_costs,
+        }
+
+
+policies = PolicyStore()
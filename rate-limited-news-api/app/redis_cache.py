@@ -25,4 +25,39 @@ async def set_scrape_status(source: str, status: str):
     await redis_client.set(f"status:{source}", status, ex=300)
 
 async def get_scrape_status(source: str):
-    return await redis_client.get(f"status:{source}")
\ No newline at end of file
+    return await redis_client.get(f"status:{source}")
+
+async def claim_scrape_run(name: str, ttl: int) -> bool:
+    """
+    Claim this refresh window for a source so only one worker process scrapes it
+    The key is left to expire rather than released: it marks the window as done.
+    """
+    return bool(await redis_client.set(f"scrape:lock:{name}", "1", nx=True, ex=max(1, ttl)))
+
+
+FETCH_META_TTL_SECONDS = 24 * 3600
+
+async def get_fetch_meta(key: str) -> dict:
+    """
+    Validators from the last full fetch of a source: etag, last_modified, body_hash
+    """
+    return await redis_client.hgetall(f"fetch:meta:{key}")
+
+async def set_fetch_meta(key: str, meta: dict):
+    meta = {field: value for field, value in meta.items() if value}
+    if not meta:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.delete(f"fetch:meta:{key}")
+        pipe.hset(f"fetch:meta:{key}", mapping=meta)
+        pipe.expire(f"fetch:meta:{key}", FETCH_META_TTL_SECONDS)
+        await pipe.execute()
+
+async def clear_fetch_meta(key: str):
+    await redis_client.delete(f"fetch:meta:{key}")
+
+async def touch_cache(key: str, ttl: int = CACHE_TTL_SECONDS) -> bool:
+    """
+    Extend a cached entry's TTL without rewriting it; False if it has already expired
+    """
+    return bool(await redis_client.expire(key, ttl))
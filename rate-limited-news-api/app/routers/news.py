@@ -1,53 +1,113 @@
-from fastapi import APIRouter, Request, Query, HTTPException, status
+from fastapi import APIRouter, Request, Response, Query, HTTPException, status
 from app.rate_limit import limiter
-from app.scraper import get_all_news, get_news_by_source, paginate
+from app.scraper import get_all_news, NEWS_LATENCY_BUDGET_SECONDS
+from app.snapshot import FEED, SnapshotExpired, decode_cursor, read_page
+from app.article_store import get_articles_page
+from app.sources import SOURCES
 
 router = APIRouter(prefix="/news")
 
 
 @router.get("/")
-@limiter.limit("3/minute") # Limit to 3 requests per minute
-async def news_endpoint(request: Request):
-    return await get_all_news()
+@limiter.limit(cost=10) # aggregate of every source: 3/minute on the anonymous tier
+async def news_endpoint(
+    request: Request,
+    response: Response,
+    budget_ms: int | None = Query(None, ge=0, le=10000, description="Latency budget; defaults to NEWS_LATENCY_BUDGET_MS"),
+):
+    """
+    Latest articles from every source that answered within the latency budget
+    Sources that did not are listed in the X-Missing-Sources header.
+    """
+    budget = budget_ms / 1000 if budget_ms is not None else NEWS_LATENCY_BUDGET_SECONDS
+    articles, missing = await get_all_news(budget)
+    if missing:
+        response.headers["X-Missing-Sources"] = ",".join(missing)
+    return articles
 
 
 
 
 @router.get("/with_pagination")
-@limiter.limit("3/minute")
+@limiter.limit(cost=3)
 async def all_news(
     request: Request,
-    limit: int = Query(10, ge=1),
-    page: int = Query(1, ge=1)
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    source: str | None = Query(None, description="Only articles from this source"),
 ):
     """
-    Fetches all news articles with pagination
+    Pages through stored article history, newest first
+    Pass the returned next_cursor to get the following page; it is null on the last page.
     """
+    label = None
+    if source:
+        registered = SOURCES.get(source.lower())
+        if not registered:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown source '{source}'")
+        label = registered.article_label
     try:
-        data = await get_all_news()
-        paginated = paginate(data, limit, page)
-        return {"total": len(data), "page": page, "limit": limit, "results": paginated}
+        page = await get_articles_page(source=label, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch news")
+    return {"limit": limit, "results": page["results"], "next_cursor": page["next_cursor"]}
     
 
 
+async def snapshot_page(feed: str, limit: int, page: int, cursor: str | None):
+    """
+    A page of the cached feed snapshot, by cursor (pinned to one snapshot version) or page number
+    """
+    try:
+        if cursor:
+            version, cursor_feed, offset = decode_cursor(cursor)
+            if cursor_feed != feed:
+                raise ValueError("cursor belongs to another feed")
+            return await read_page(feed, limit, offset, version)
+        return await read_page(feed, limit, (page - 1) * limit)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    except SnapshotExpired:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Snapshot expired; start again from the first page")
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch news")
+
+
+@router.get("/feed")
+@limiter.limit(cost=1)
+async def news_feed(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Pages through the latest merged feed of every source, served from a Redis snapshot
+    Follow next_cursor to stay on the same snapshot while newer scrapes are published.
+    """
+    data = await snapshot_page(FEED, limit, page, cursor)
+    return {"total": data["total"], "page": page, "limit": limit, "version": data["version"],
+            "results": data["results"], "next_cursor": data["next_cursor"]}
+
+
 @router.get("/{source}")
-@limiter.limit("3/minute")
+@limiter.limit(cost=1)
 async def news_by_source(
     source: str,
     request: Request,
     limit: int = Query(10, ge=1),
-    page: int = Query(1, ge=1)
+    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
 ):
     """
     Fetches news articles from a specific source with pagination
     """
-    try:
-        data = await get_news_by_source(source)
-        if not data:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No news found for '{source}'")
-        paginated = paginate(data, limit, page)
-        return {"total": len(data), "page": page, "limit": limit, "results": paginated}
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch news")
\ No newline at end of file
+    if source.lower() not in SOURCES:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No news found for '{source}'")
+    data = await snapshot_page(source.lower(), limit, page, cursor)
+    if not data["total"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No news found for '{source}'")
+    return {"total": data["total"], "page": page, "limit": limit, "version": data["version"],
+            "results": data["results"], "next_cursor": data["next_cursor"]}
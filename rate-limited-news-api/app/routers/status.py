@@ -1,6 +1,12 @@
 # app/routes/status.py
 from fastapi import APIRouter
 from app.redis_cache import get_scrape_status
+from app.http_client import get_pool_stats
+from app.redis_cache import CACHE_TTL_SECONDS
+from app.scheduler import get_scheduler_state
+from app.sources import SOURCES
+from app.circuit_breaker import get_breaker_states
+from app.rate_limit_policy import policies
 
 router = APIRouter()
 
@@ -12,16 +18,18 @@ async def get_status():
     """
     return {
         "scrape_status": {
-            "bbc": await get_scrape_status("bbc"),
-            "cnn": await get_scrape_status("cnn"),
-            "hn": await get_scrape_status("hn")
+            source.key: await get_scrape_status(source.key)
+            for source in SOURCES.values()
         },
+        "circuit_breakers": get_breaker_states(),
         "rate_limit_info": {
-            "limit": "3/minute (default)",
-            "enforced_by": "SlowAPI"
+            **policies.describe(),
+            "enforced_by": "Redis GCRA (shared across workers)"
         },
         "cache": {
-            "ttl_seconds": 60,
+            "ttl_seconds": CACHE_TTL_SECONDS,
             "backing_store": "Redis"
-        }
+        },
+        "scheduler": get_scheduler_state(),
+        "http_pool": get_pool_stats()
     }
@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, List
+from app.logger import logger
+from app.redis_cache import claim_scrape_run
+
+ScrapeJob = Callable[[], Awaitable[List[Dict]]]
+
+JITTER = 0.1  # +/-10% per run so sources (and workers) drift apart instead of firing together
+
+# { name: {"interval", "running", "runs", "errors", "last_run", "last_duration_ms", "last_result", "last_count", "next_run"} }
+_state: Dict[str, Dict] = {}
+_tasks: Dict[str, asyncio.Task] = {}
+_refreshed: Dict[str, asyncio.Event] = {}
+
+
+async def run_job(name: str, job: ScrapeJob, interval: float):
+    """
+    Run one scrape for a source unless another worker already took this window
+    """
+    state = _state[name]
+    # Claim slightly less than the interval so the next window is always free
+    if not await claim_scrape_run(name, int(interval * (1 - JITTER))):
+        state["last_result"] = "skipped"
+        return
+
+    state["running"] = True
+    state["last_run"] = time.time()
+    start = time.perf_counter()
+    try:
+        articles = await job()
+        state["last_count"] = len(articles)
+        state["last_result"] = "ok" if articles else "empty"
+    except Exception as e:
+        state["errors"] += 1
+        state["last_result"] = "error"
+        logger.error("Scheduled scrape failed for %s: %s", name, e, extra={"source": name})
+    finally:
+        state["running"] = False
+        state["runs"] += 1
+        state["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+        # Wake readers waiting on a cold cache, then arm a fresh event for the next run
+        _refreshed[name].set()
+        _refreshed[name] = asyncio.Event()
+
+
+async def schedule_loop(name: str, job: ScrapeJob, interval: float):
+    # First run right after startup, staggered by a little jitter
+    delay = random.uniform(0, interval * JITTER)
+    while True:
+        _state[name]["next_run"] = time.time() + delay
+        await asyncio.sleep(delay)
+        await run_job(name, job, interval)
+        delay = interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+async def start_scheduler(jobs: Dict[str, tuple[ScrapeJob, float]]):
+    """
+    Start one refresh loop per source (called from create_app() on startup)
+    `jobs` maps a source name to its scrape job and refresh interval in seconds.
+    """
+    for name, (job, interval) in jobs.items():
+        if name in _tasks:
+            continue
+        _state[name] = {
+            "interval": interval,
+            "running": False,
+            "runs": 0,
+            "errors": 0,
+            "last_run": None,
+            "last_duration_ms": None,
+            "last_result": None,
+            "last_count": None,
+            "next_run": None,
+        }
+        _refreshed[name] = asyncio.Event()
+        _tasks[name] = asyncio.create_task(schedule_loop(name, job, interval))
+    logger.info("Scrape scheduler started for %s", ", ".join(jobs))
+
+
+async def stop_scheduler():
+    for task in _tasks.values():
+        task.cancel()
+    await asyncio.gather(*_tasks.values(), return_exceptions=True)
+    _tasks.clear()
+    _refreshed.clear()
+
+
+def is_scheduled(name: str) -> bool:
+    return name in _refreshed
+
+
+async def wait_for_refresh(name: str, timeout: float) -> bool:
+    """
+    Wait for the next completed run of a source in this worker; False if it is not scheduled or times out
+    Runs skipped because another worker holds the claim do not wake waiters, so callers should
+    also re-check the cache.
+    """
+    event = _refreshed.get(name)
+    if event is None:
+        return False
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def get_scheduler_state():
+    return {name: dict(state) for name, state in _state.items()}
@@ -1,12 +1,35 @@
+import os
 import httpx
 import asyncio
-from bs4 import BeautifulSoup
-from typing import List, Dict
-from app.redis_cache import get_cache, set_cache
-from app.logger import logger
+from functools import partial
+from urllib.parse import urlsplit
+import hashlib
+from typing import List, Dict, NamedTuple
+from app.redis_cache import get_cache, set_cache, touch_cache, get_fetch_meta, set_fetch_meta, clear_fetch_meta
+from app.logger import logger, LOG_SAMPLE_RATE
 import time
 import random
 from app.redis_cache import set_scrape_status
+from app.http_client import get_http_client, record_request
+from app.parsers import parse_articles
+from app.article_store import upsert_articles
+from app.circuit_breaker import get_breaker, OPEN
+from app.snapshot import rebuild_snapshot
+from app.scheduler import is_scheduled, wait_for_refresh
+from app.sources import Source, SOURCES
+
+# How long a request waits for the first scheduled scrape when the cache is cold
+COLD_CACHE_WAIT_SECONDS = 5.0
+# How often that wait re-reads Redis, in case another worker won the scrape claim
+COLD_CACHE_POLL_SECONDS = 0.25
+
+# How long /news/ waits for all sources before answering with the ones that finished
+NEWS_LATENCY_BUDGET_SECONDS = float(os.getenv("NEWS_LATENCY_BUDGET_MS", 300)) / 1000
+
+# Scrapes in flight across all sources (the HTTP pool allows 20 connections)
+MAX_CONCURRENT_SCRAPES = 8
+_scrape_slots = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+_source_semaphores: Dict[str, asyncio.Semaphore] = {}
 
 
 USER_AGENTS = [
@@ -18,226 +41,207 @@ USER_AGENTS = [
 ]
 
 
-async def fetch_html(url: str) -> str | None:
+class FetchResult(NamedTuple):
+    html: str | None
+    unchanged: bool = False   # 304, or same body hash as the last full fetch
+    validators: dict = {}     # etag / last_modified / body_hash to store once the page is cached
+
+
+async def fetch_html(url: str, meta_key: str | None = None) -> FetchResult:
     """
     Fetches HTML content from a given URL with a random User-Agent
     and a timeout to prevent hanging requests.
+    Uses the shared app-lifetime client, so connections are reused between scrapes.
+    With a meta_key the request is conditional on the validators saved for that source
+    (If-None-Match / If-Modified-Since), and a body identical to the last one is reported
+    as unchanged, so the caller can skip parsing.
     """
+    host = urlsplit(url).hostname
+    start = time.perf_counter()
     try:
         headers = {
             "User-Agent": random.choice(USER_AGENTS)
         }
-        # Use the configured timeout and headers
-        async with httpx.AsyncClient(timeout=10.0, headers=headers) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.text
+        meta = await get_fetch_meta(meta_key) if meta_key else {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        # The shared client carries the configured timeout and connection limits
+        response = await get_http_client().get(url, headers=headers)
+        if response.status_code == 304:
+            record_request(host, time.perf_counter() - start, ok=True, not_modified=True)
+            return FetchResult(None, unchanged=True)
+        response.raise_for_status()
+        record_request(host, time.perf_counter() - start, ok=True)
+
+        body_hash = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        if meta.get("body_hash") == body_hash:
+            return FetchResult(None, unchanged=True)
+        return FetchResult(response.text, validators={
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "body_hash": body_hash,
+        })
     except httpx.HTTPError:
-        return None
-    
+        record_request(host, time.perf_counter() - start, ok=False)
+        return FetchResult(None)
 
 
-async def fetch_bbc_news() -> List[Dict]:
+
+def get_source_semaphore(source: Source) -> asyncio.Semaphore:
+    if source.name not in _source_semaphores:
+        _source_semaphores[source.name] = asyncio.Semaphore(source.max_concurrency)
+    return _source_semaphores[source.name]
+
+
+async def publish_snapshot():
     """
-    Fetches the latest news articles from BBC News and scrapes the HTML content
+    Rebuild the paged feed snapshot (app/snapshot.py) after a scrape; a failure here
+    is logged but does not count against the source
     """
-    # caching
-    cache_key = "news:bbc"
-    cached = await get_cache(cache_key)
-    if cached:
-        logger.info(f"Cache hit for {cache_key}")
-        return cached
-    logger.info(f"Cache miss for {cache_key}. Scraping BBC News...")
-    start = time.time()
-
     try:
-        html = await fetch_html("https://www.bbc.com/news")
-        if not html:
-            logger.warning("Empty or failed HTML fetch for BBC")
-            return []
-
-        # Parse the HTML content using BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
-        articles = []
-
-        # Select news articles from the BBC News page
-        # Adjust the selector based on the actual structure of the page
-        # This example assumes articles are linked with a specific data-testid attribute
-        for item in soup.select("a[data-testid='internal-link']"):
-
-            # Extract the title and URL from each article item
-            title = item.get_text(strip=True)
-            url = item["href"]
-            full_url = f"https://www.bbc.com{url}" if url.startswith("/") else url
-
-            # Append the article details to the list
-            articles.append({
-                "source": "bbc",
-                "title": title,
-                "url": full_url,
-                "published_at": None
-            })
+        await rebuild_snapshot()
+    except Exception as e:
+        logger.error("Failed to rebuild the news snapshot: %r", e)
 
-        # cache, log, and return
-        articles = articles[:10]
-        await set_cache(cache_key, articles)
-        await set_scrape_status("bbc", "ok")
-        logger.info(f"Scraped BBC ({len(articles)} articles) in {time.time() - start:.2f}s")
-        return articles
 
-    except Exception as e:
-        logger.error(f"Error scraping BBC: {e}")
-        await set_scrape_status("bbc", "error")
+async def keep_last_good(source: Source) -> List[Dict]:
+    """
+    Keep serving the last good articles while a source is failing: extend their TTL
+    instead of letting them expire
+    """
+    cached = await get_cache(source.cache_key)
+    if cached is None:
         return []
+    await touch_cache(source.cache_key, source.ttl)
+    return cached
 
 
-
-async def fetch_cnn_news() -> List[Dict]:
+async def scrape_source(source: Source) -> List[Dict]:
     """
-    Fetches the latest news articles from CNN and scrapes the HTML content
+    Scrapes one source and writes its articles to the cache
+    Run by the background scheduler, never from a request handler.
+    Bounded per source (max_concurrency) and globally (MAX_CONCURRENT_SCRAPES),
+    and the fetch and the parse are each cut off after source.timeout.
+    If the page has not changed since the last scrape, parsing is skipped and the
+    cached articles just get a fresh TTL.
+    Failing sources trip a circuit breaker (app/circuit_breaker.py): while it is open
+    the source is not contacted and the last good articles keep being served.
     """
-    # caching
-    cache_key = "news:cnn"
-    cached = await get_cache(cache_key)
-    if cached:
-        logger.info(f"Cache hit for {cache_key}")
-        return cached
-    logger.info(f"Cache miss for {cache_key}. Scraping CNN News...")
+    breaker = get_breaker(source.name, source.interval)
+    if not breaker.allow():
+        await set_scrape_status(source.key, "circuit_open")
+        logger.info("Circuit open for %s; serving last good articles", source.name, extra={"source": source.name})
+        return await keep_last_good(source)
+
+    logger.info("Refreshing %s. Scraping %s...", source.cache_key, source.name, extra={"source": source.name})
     start = time.time()
-    
+
     try:
-        html = await fetch_html("https://edition.cnn.com/world")
-        if not html:
-            logger.warning("Empty or failed HTML fetch for CNN")
-            return []
-
-        soup = BeautifulSoup(html, "html.parser")
-        articles = []
-
-        # Select news articles from the CNN World page
-        # uses a selector that matches CNN's article links
-        for item in soup.select("a[data-link-type='article']"):
-            title = item.get_text(strip=True)
-            url = item["href"]
-            full_url = f"https://edition.cnn.com{url}" if url.startswith("/") else url
-            articles.append({
-                "source": "cnn",
-                "title": title,
-                "url": full_url,
-                "published_at": None
-            })
+        async with get_source_semaphore(source), _scrape_slots:
+            # Only ask for a conditional fetch while there is a cached result to fall back on
+            cached = await get_cache(source.cache_key)
+            page = await asyncio.wait_for(
+                fetch_html(source.url, meta_key=source.key if cached is not None else None),
+                source.timeout,
+            )
+
+            if page.unchanged:
+                breaker.record_success()
+                if await touch_cache(source.cache_key, source.ttl):
+                    await upsert_articles(cached)  # still on the page: bump last_seen
+                    await set_scrape_status(source.key, "ok")
+                    await publish_snapshot()
+                    logger.info("%s unchanged; kept %d cached articles", source.name, len(cached), extra={"source": source.name})
+                    return cached
+                # Entry expired between the read and the touch: force a full fetch next time
+                await clear_fetch_meta(source.key)
+                return []
+
+            if not page.html:
+                logger.warning("Empty or failed HTML fetch for %s", source.name, extra={"source": source.name})
+                breaker.record_failure("empty or failed fetch")
+                await set_scrape_status(source.key, "error")
+                return await keep_last_good(source)
+
+            # Parse off the event loop; see app/parsers.py
+            articles = await asyncio.wait_for(parse_articles(source, page.html), source.timeout)
 
         # cache, log, and return
-        articles = articles[:10]
-        await set_cache(cache_key, articles)
-        await set_scrape_status("cnn", "ok")
-        logger.info(f"Scraped CNN ({len(articles)} articles) in {time.time() - start:.2f}s")
+        breaker.record_success()
+        await set_cache(source.cache_key, articles, ttl=source.ttl)
+        await upsert_articles(articles)
+        await set_fetch_meta(source.key, page.validators)
+        await set_scrape_status(source.key, "ok")
+        await publish_snapshot()
+        logger.info(
+            "Scraped %s (%d articles) in %.2fs", source.name, len(articles), time.time() - start,
+            extra={"source": source.name, "duration_ms": round((time.time() - start) * 1000, 1)},
+        )
         return articles
 
     except Exception as e:
-        logger.error(f"Error scraping CNN: {e}")
-        await set_scrape_status("cnn", "error")
-        return []
-
+        logger.error("Error scraping %s: %r", source.name, e, extra={"source": source.name})
+        breaker.record_failure(repr(e))
+        await set_scrape_status(source.key, "error")
+        return await keep_last_good(source)
 
 
-async def fetch_hn_news() -> List[Dict]:
+async def read_cached_news(source: Source) -> List[Dict]:
     """
-    Fetches the latest news articles from Hacker News and scrapes the HTML content
+    Returns cached articles for a source; the scheduler keeps them fresh ahead of expiry
+    On a cold cache (e.g. right after startup) waits briefly for the scheduler's run
+    instead of scraping inline.
     """
-    # caching
-    cache_key = "news:hn"
-    cached = await get_cache(cache_key)
-    if cached:
-        logger.info(f"Cache hit for {cache_key}")
-        return cached
-    
-    logger.info(f"Cache miss for {cache_key}. Scraping Hacker News...")
-    start = time.time()
-    
-    try:
-        html = await fetch_html("https://news.ycombinator.com/")
-        if not html:
-            logger.warning("Empty or failed HTML fetch for Hacker News")
-            return []
-
-        soup = BeautifulSoup(html, "html.parser")
-        articles = []
-
-        # Select news articles from the Hacker News page
-        # This assumes articles are listed in <tr> elements with class "athing"
-        for row in soup.select("tr.athing"):
-            title_tag = row.select_one("span.titleline a") # This selects the title link
-            if not title_tag:
-                continue
-            
-            # Extract the title and URL from each article item
-            # The title is in the <a> tag with class "titlelink"
-            title = title_tag.get_text(strip=True)
-            url = title_tag.get("href")
-            if not url:
-                continue
-
-
-            articles.append({
-                "source": "hackernews",
-                "title": title,
-                "url": url,
-                "published_at": None  # HN does not give this directly
-            })
-
-        # cache and return
-        articles = articles[:10]
-        await set_cache(cache_key, articles)
-        await set_scrape_status("hn", "ok")
-        logger.info(f"Scraped Hacker News ({len(articles)} articles) in {time.time() - start:.2f}s")
-        return articles
-    
-    except Exception as e:
-        logger.error(f"Error scraping HN: {e}")
-        await set_scrape_status("hn", "error")
+    cached = await get_cache(source.cache_key)
+    # Nothing to wait for while the source's circuit is open
+    if cached is None and get_breaker(source.name, source.interval).state != OPEN and is_scheduled(source.name):
+        deadline = time.monotonic() + COLD_CACHE_WAIT_SECONDS
+        while cached is None and (remaining := deadline - time.monotonic()) > 0:
+            # A run in this worker wakes us at once; a run by whichever worker won the
+            # claim only shows up in Redis, so re-read it on every poll
+            await wait_for_refresh(source.name, min(COLD_CACHE_POLL_SECONDS, remaining))
+            cached = await get_cache(source.cache_key)
+    if cached is None:
+        logger.warning("Cache miss for %s; waiting on the next scheduled scrape", source.cache_key, extra={"source": source.name})
         return []
+    # One line per read adds up; keep a sample (LOG_SAMPLE_RATE, 1% by default)
+    logger.info("Cache hit for %s", source.cache_key, extra={"source": source.name, "sample_rate": LOG_SAMPLE_RATE})
+    return cached
 
 
-
-
-async def get_all_news() -> List[Dict]:
+async def get_all_news(budget: float = NEWS_LATENCY_BUDGET_SECONDS) -> tuple[List[Dict], List[str]]:
     """
-    Fetches news articles from multiple sources asynchronously
+    Fetches news articles from all registered sources asynchronously
+    Returns whatever sources answered within `budget` seconds plus the names of the
+    ones that did not. Reads still pending are cancelled: they only wait on the scheduler,
+    which fills the cache for the next request either way.
     """
-    results = await asyncio.gather(
-        fetch_bbc_news(),
-        fetch_cnn_news(),
-        fetch_hn_news()
-    )
-    all_articles = []
-    for site_articles in results:
-        all_articles.extend(site_articles)
-    return all_articles
-
-
-
-# source-specific fetch functions
-SCRAPER_MAP = {
-    "bbc": fetch_bbc_news,
-    "cnn": fetch_cnn_news,
-    "hackernews": fetch_hn_news,
+    tasks = {
+        name: asyncio.create_task(read_cached_news(source))
+        for name, source in SOURCES.items()
+    }
+    await asyncio.wait(tasks.values(), timeout=budget)
+
+    all_articles, missing = [], []
+    for name, task in tasks.items():
+        if not task.done():
+            missing.append(name)
+            task.cancel()
+        elif task.exception() is not None:
+            logger.error("Reading cached news for %s failed: %r", name, task.exception(), extra={"source": name})
+            missing.append(name)
+        else:
+            all_articles.extend(task.result())
+    if missing:
+        logger.info("Latency budget of %.0fms hit; missing %s", budget * 1000, ", ".join(missing), extra={"missing": missing})
+    return all_articles, missing
+
+
+# scrape jobs and their intervals, run by app.scheduler
+SCRAPE_JOBS = {
+    name: (partial(scrape_source, source), source.interval)
+    for name, source in SOURCES.items()
 }
-
-async def get_news_by_source(source: str) -> List[Dict]:
-    """
-    Fetches news articles from a specific source based on the provided source name.
-    """
-    fetcher = SCRAPER_MAP.get(source.lower())
-    if not fetcher:
-        return []
-    return await fetcher()
-
-
-def paginate(data: List[Dict], limit: int = 10, page: int = 1) -> List[Dict]:
-    """
-    Paginates the given data
-    """
-    start = (page - 1) * limit
-    end = start + limit
-    return data[start:end]
\ No newline at end of file
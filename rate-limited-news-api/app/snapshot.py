@@ -0,0 +1,108 @@
+import json
+import base64
+import hashlib
+from itertools import zip_longest
+from typing import List, Dict
+from app.redis_cache import redis_client, get_cache
+from app.sources import SOURCES
+
+# Merged, paged view of the cached feed. Each build is stored under its own version
+# (a hash of its content), so a cursor keeps reading the snapshot it started on even
+# after a newer one is published; a list expires SNAPSHOT_TTL_SECONDS after its last use
+# (the rebuild that produced it or a page read).
+SNAPSHOT_TTL_SECONDS = 600
+CURRENT_KEY = "news:snapshot:current"
+FEED = "all"  # list name for the merged feed; other lists are named after sources
+
+
+class SnapshotExpired(Exception):
+    pass
+
+
+def snapshot_key(version: str, feed: str) -> str:
+    return f"news:snapshot:{version}:{feed}"
+
+
+def merge_feed(per_source: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Round-robin by position: every source's top story, then every source's second, ...
+    """
+    merged = []
+    for row in zip_longest(*per_source.values()):
+        merged.extend(article for article in row if article is not None)
+    return merged
+
+
+async def rebuild_snapshot() -> str | None:
+    """
+    Build the snapshot from the per-source caches and make it current
+    Called after every scrape; unchanged content maps to the same version, which
+    only gets its TTL extended.
+    """
+    per_source = {name: await get_cache(source.cache_key) or [] for name, source in SOURCES.items()}
+    lists = {FEED: merge_feed(per_source), **per_source}
+    if not lists[FEED]:
+        return None
+
+    encoded = {feed: [json.dumps(article, sort_keys=True) for article in articles] for feed, articles in lists.items()}
+    version = hashlib.blake2b("\n".join(encoded[FEED]).encode(), digest_size=8).hexdigest()
+
+    exists = await redis_client.exists(snapshot_key(version, FEED))
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for feed, items in encoded.items():
+            key = snapshot_key(version, feed)
+            if not exists:
+                pipe.delete(key)
+                if items:
+                    pipe.rpush(key, *items)
+            pipe.expire(key, SNAPSHOT_TTL_SECONDS)
+        pipe.set(CURRENT_KEY, version, ex=SNAPSHOT_TTL_SECONDS)
+        await pipe.execute()
+    return version
+
+
+def encode_cursor(version: str, feed: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}|{feed}|{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, int]:
+    """
+    Raises ValueError for anything that is not a cursor we handed out
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, feed, offset = raw.split("|")
+        return version, feed, int(offset)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+async def read_page(feed: str, limit: int, offset: int = 0, version: str | None = None) -> Dict:
+    """
+    One page of a snapshot list: LRANGE + LLEN + EXPIRE in a single round trip
+    Without a version the current snapshot is used (built on demand if there is none yet).
+    Raises SnapshotExpired when a cursor's version is gone.
+    """
+    if version is None:
+        version = await redis_client.get(CURRENT_KEY) or await rebuild_snapshot()
+        if version is None:
+            return {"version": None, "total": 0, "results": [], "next_cursor": None}
+
+    key = snapshot_key(version, feed)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.lrange(key, offset, offset + limit - 1)
+        pipe.llen(key)
+        # Reading keeps the version alive; EXPIRE on the merged list doubles as the existence check
+        pipe.expire(key, SNAPSHOT_TTL_SECONDS)
+        pipe.expire(snapshot_key(version, FEED), SNAPSHOT_TTL_SECONDS)
+        items, total, _, exists = await pipe.execute()
+    if not exists:
+        raise SnapshotExpired(version)
+
+    next_offset = offset + len(items)
+    return {
+        "version": version,
+        "total": total,
+        "results": [json.loads(item) for item in items],
+        "next_cursor": encode_cursor(version, feed, next_offset) if next_offset < total else None,
+    }
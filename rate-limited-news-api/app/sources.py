@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Dict
+from app.redis_cache import CACHE_TTL_SECONDS
+
+
+@dataclass(frozen=True)
+class Source:
+    """
+    Declarative description of a news source; the generic engine in app/scraper.py does the rest
+    Plain data only, so it can be shipped to the parse pool as-is.
+    """
+    name: str                       # public name, used in /news/{source}
+    url: str                        # page to scrape
+    link_selector: str              # CSS selector for the article <a> tags
+    base_url: str | None = None     # relative hrefs are joined onto this; None keeps hrefs as-is
+    label: str | None = None        # "source" field in article dicts (defaults to name)
+    status_key: str | None = None   # key in scrape:status / cache key suffix (defaults to name)
+    ttl: int = CACHE_TTL_SECONDS    # cache TTL in seconds
+    limit: int = 10                 # articles kept per scrape
+    interval: float = CACHE_TTL_SECONDS * 0.75  # refresh interval, kept below ttl
+    timeout: float = 15.0           # budget for the fetch, and again for the parse
+    max_concurrency: int = 1        # concurrent scrapes of this source
+
+    @property
+    def key(self) -> str:
+        return self.status_key or self.name
+
+    @property
+    def cache_key(self) -> str:
+        return f"news:{self.key}"
+
+    @property
+    def article_label(self) -> str:
+        return self.label or self.name
+
+
+# Registered sources, keyed by public name
+SOURCES: Dict[str, Source] = {}
+
+
+def register_source(source: Source) -> Source:
+    if source.interval >= source.ttl:
+        raise ValueError(f"{source.name}: refresh interval must be shorter than the cache TTL")
+    SOURCES[source.name] = source
+    return source
+
+
+register_source(Source(
+    name="bbc",
+    url="https://www.bbc.com/news",
+    # Articles are linked with a data-testid="internal-link" attribute
+    link_selector="a[data-testid='internal-link']",
+    base_url="https://www.bbc.com",
+))
+
+register_source(Source(
+    name="cnn",
+    url="https://edition.cnn.com/world",
+    link_selector="a[data-link-type='article']",
+    base_url="https://edition.cnn.com",
+))
+
+register_source(Source(
+    name="hackernews",
+    url="https://news.ycombinator.com/",
+    # Stories are <tr class="athing"> rows; the title link is the first <a> in span.titleline
+    link_selector="tr.athing span.titleline > a",
+    base_url="https://news.ycombinator.com/",  # "Ask HN" posts link to item?id=...
+    status_key="hn",
+    interval=CACHE_TTL_SECONDS * 0.5,  # small page, changes often
+))
@@ -0,0 +1,72 @@
+"""
+Benchmark: page latency at increasing depth, LIMIT/OFFSET vs keyset cursor
+
+Fills a throwaway SQLite article store, then fetches one page at several depths both ways.
+Keyset walks the (first_seen, id) index from the cursor, so its cost stays flat.
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.article_pagination --articles 200000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ["ARTICLE_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "articles.db")
+
+import app.article_store as store  # noqa: E402
+
+
+def fill(count: int):
+    store._open()
+    now = time.time()
+    with store._conn:
+        store._conn.executemany(store.UPSERT, (
+            {"id": store.article_id(f"https://example.com/{i}"), "source": ("bbc", "cnn", "hackernews")[i % 3],
+             "title": f"Story {i}", "url": f"https://example.com/{i}", "published_at": None, "now": now - count + i // 10}
+            for i in range(count)
+        ))
+
+
+def offset_page(limit: int, offset: int):
+    return store._conn.execute(
+        "SELECT id, source, title, url, published_at, first_seen, last_seen FROM articles "
+        "ORDER BY first_seen DESC, id DESC LIMIT ? OFFSET ?", (limit, offset)
+    ).fetchall()
+
+
+def timed(fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    fill(args.articles)
+    print(f"articles: {args.articles}, page size: {args.limit}")
+    print(f"{'depth':>9}{'offset ms':>12}{'keyset ms':>12}")
+    for depth in (0, 1_000, 10_000, 100_000, args.articles - args.limit):
+        if depth > args.articles - args.limit:
+            continue
+        # cursor of the row just before `depth`, as a client would hold after paging there
+        row = offset_page(1, depth - 1)[0] if depth else None
+        cursor = store.encode_cursor(row["first_seen"], row["id"]) if row else None
+        keyset = timed(lambda: store._page(None, args.limit, store.decode_cursor(cursor) if cursor else None))
+        offset = timed(lambda: offset_page(args.limit, depth))
+        assert [r["id"] for r in offset_page(args.limit, depth)] == [r["id"] for r in store._page(None, args.limit, store.decode_cursor(cursor) if cursor else None)]
+        print(f"{depth:>9}{offset:>12.3f}{keyset:>12.3f}")
+    await store.close_article_store()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
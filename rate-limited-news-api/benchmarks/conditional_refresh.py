@@ -0,0 +1,101 @@
+"""
+Benchmark: cost of a refresh cycle when the page has not changed
+
+Runs app.scraper.scrape_source repeatedly against a local server serving a synthetic
+front page (needs the local Redis the app uses). Three server behaviours:
+  changing   body differs every time            -> full download + parse (the old behaviour)
+  etag       stable body with an ETag          -> If-None-Match -> 304, no body, no parse
+  no-etag    stable body, no validators        -> full download, body hash matches, no parse
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.conditional_refresh --refreshes 50
+"""
+import argparse
+import asyncio
+import hashlib
+import statistics
+import threading
+import time
+
+from app.http_client import close_http_client
+from app.parsers import close_parse_pool
+from app.redis_cache import redis_client
+from app.scraper import scrape_source
+from app.sources import Source
+from benchmarks.parser_throughput import synthetic_page
+
+PAGE = synthetic_page("bbc").encode()
+ETAG = '"' + hashlib.md5(PAGE).hexdigest() + '"'
+
+
+def start_server() -> int:
+    """
+    Keep-alive HTTP server on a background thread; the path picks the behaviour
+    """
+    ready = threading.Event()
+    port = {}
+    counters = {"bytes": 0, "n": 0}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode().lower()
+                path = head.split(" ", 2)[1]
+                body, extra = PAGE, ""
+                if path == "/changing":
+                    counters["n"] += 1
+                    body = PAGE.replace(b"Headline 0", b"Headline %d" % counters["n"])
+                elif path == "/etag":
+                    extra = f"ETag: {ETAG}\r\n"
+                    if f"if-none-match: {ETAG}" in head:
+                        writer.write(f"HTTP/1.1 304 Not Modified\r\n{extra}Content-Length: 0\r\n\r\n".encode())
+                        await writer.drain()
+                        continue
+                counters["bytes"] += len(body)
+                writer.write(f"HTTP/1.1 200 OK\r\n{extra}Content-Type: text/html\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(main()), daemon=True).start()
+    ready.wait()
+    return port["port"], counters
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refreshes", type=int, default=50)
+    args = parser.parse_args()
+
+    port, counters = start_server()
+    print(f"page size: {len(PAGE) / 1024:.0f} KiB, refreshes per mode: {args.refreshes}")
+    for mode in ("changing", "etag", "no-etag"):
+        source = Source(name=f"bench-{mode}", url=f"http://127.0.0.1:{port}/{mode}", link_selector="a[data-testid='internal-link']")
+        await redis_client.delete(source.cache_key, f"fetch:meta:{source.key}")
+        await scrape_source(source)  # first scrape always downloads and parses
+
+        sent_before = counters["bytes"]
+        durations = []
+        for _ in range(args.refreshes):
+            start = time.perf_counter()
+            articles = await scrape_source(source)
+            durations.append((time.perf_counter() - start) * 1000)
+        body_kib = (counters["bytes"] - sent_before) / 1024 / args.refreshes
+        print(f"{mode:<9} median={statistics.median(durations):7.2f}ms  p90={statistics.quantiles(durations, n=10)[-1]:7.2f}ms  "
+              f"body/refresh={body_kib:6.1f}KiB  articles={len(articles)}")
+        await redis_client.delete(source.cache_key, f"fetch:meta:{source.key}", f"status:{source.key}")
+
+    await close_http_client()
+    close_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Benchmark: time a request-path log call costs the calling (event loop) thread
+
+  sync stream      the old setup: basicConfig-style StreamHandler, f-string message, write on the caller
+  queue + json     app.logger: QueueHandler on the caller, JSON formatting and I/O on the listener thread
+  queue, sampled   same, with the 1% sample rate used for "Cache hit" lines
+
+Lines go to a file (or --sink /dev/stderr to include terminal cost). --sink-latency-us makes
+every write stall, like stdout piped into a log collector that is falling behind.
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.logging_overhead --lines 50000
+"""
+import argparse
+import logging
+import logging.handlers
+import queue
+import statistics
+import time
+
+from app.logger import JsonFormatter, RequestIdFilter, SamplingFilter, DropWhenFullQueueHandler, request_id_var
+
+
+class SlowSink:
+    def __init__(self, stream, latency_us: float):
+        self.stream = stream
+        self.latency = latency_us / 1e6
+
+    def write(self, data):
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def measure(log_once, lines: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(lines):
+        start = time.perf_counter_ns()
+        log_once()
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return statistics.mean(samples) / 1000, samples[int(len(samples) * 0.99)] / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--sink", default="/tmp/news-api-logging-bench.log")
+    parser.add_argument("--sink-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    def open_sink(mode):
+        stream = open(args.sink, mode)
+        return SlowSink(stream, args.sink_latency_us) if args.sink_latency_us else stream
+    request_id_var.set("bench-request")
+    key = "news:hn"
+
+    sync_handler = logging.StreamHandler(open_sink("w"))
+    sync_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    sync_logger = make_logger("bench.sync", sync_handler)
+
+    def queued_logger(name):
+        log_queue = queue.Queue(10_000)
+        handler = DropWhenFullQueueHandler(log_queue)
+        handler.addFilter(RequestIdFilter())
+        handler.addFilter(SamplingFilter())
+        stream = logging.StreamHandler(open_sink("a"))
+        stream.setFormatter(JsonFormatter())
+        listener = logging.handlers.QueueListener(log_queue, stream)
+        listener.start()
+        return make_logger(name, handler), listener
+
+    queue_logger, queue_listener = queued_logger("bench.queue")
+    sampled_logger, sampled_listener = queued_logger("bench.sampled")
+
+    rows = [
+        ("sync stream", lambda: sync_logger.info(f"Cache hit for {key}")),
+        ("queue + json", lambda: queue_logger.info("Cache hit for %s", key, extra={"source": "hackernews"})),
+        ("queue, sampled 1%", lambda: sampled_logger.info(
+            "Cache hit for %s", key, extra={"source": "hackernews", "sample_rate": 0.01})),
+    ]
+    print(f"{args.lines} lines per setup, sink {args.sink}, write stall {args.sink_latency_us:.0f}us")
+    print(f"{'setup':<20}{'mean us':>10}{'p99 us':>10}")
+    for label, log_once in rows:
+        mean, p99 = measure(log_once, args.lines)
+        print(f"{label:<20}{mean:>10.2f}{p99:>10.2f}")
+        # let the listener drain before the next row
+        while not queue_listener.queue.empty() or not sampled_listener.queue.empty():
+            time.sleep(0.05)
+    queue_listener.stop()
+    sampled_listener.stop()
+
+
+if __name__ == "__main__":
+    main()
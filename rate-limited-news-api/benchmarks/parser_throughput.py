@@ -0,0 +1,125 @@
+"""
+Benchmark: parse throughput per source for html.parser vs lxml vs selectolax
+
+Runs app.parsers.parse_source over saved front pages in benchmarks/fixtures/<source>.html.
+Save real pages once with --save-fixtures (needs network); without fixtures, synthetic pages
+with the same selectors and roughly front-page size are generated.
+Also reports the round trip through the parse pool and the longest event loop stall
+while scraping, parsing inline vs through parse_articles().
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.parser_throughput --save-fixtures
+    python -m benchmarks.parser_throughput --seconds 2
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+
+from app.parsers import parse_source, LXML_AVAILABLE, SELECTOLAX_AVAILABLE, parse_articles, close_parse_pool
+from app.sources import SOURCES
+import app.parsers as parsers
+
+FIXTURES = Path(__file__).parent / "fixtures"
+HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/109.0.0.0 Safari/537.36"}
+
+
+def synthetic_page(source: str) -> str:
+    """
+    A page shaped like the live one: lots of unrelated markup around the matching links
+    """
+    filler = "<div class='promo'><p>" + "lorem ipsum dolor sit amet " * 20 + "</p><img src='/i.png' alt=''></div>"
+    if source == "hackernews":
+        rows = "".join(
+            f"<tr class='athing' id='{i}'><td class='title'><span class='titleline'><a href='https://example.com/{i}'>Story {i}</a>"
+            f"<span class='sitebit comhead'> (<a href='from?site=example.com'>example.com</a>)</span></span></td></tr>"
+            f"<tr><td class='subtext'><span class='score'>{i} points</span> {filler}</td></tr>"
+            for i in range(30)
+        )
+        return f"<html><body><table>{rows}</table></body></html>"
+    attr = "data-testid='internal-link'" if source == "bbc" else "data-link-type='article'"
+    cards = "".join(f"<section>{filler}<a {attr} href='/news/{i}'><span>Headline {i}</span></a></section>" for i in range(250))
+    return f"<html><head><script>{'var x=1;' * 2000}</script></head><body>{cards}</body></html>"
+
+
+def load_pages() -> dict:
+    pages = {}
+    for source in SOURCES:
+        path = FIXTURES / f"{source}.html"
+        pages[source] = path.read_text(encoding="utf-8") if path.exists() else synthetic_page(source)
+    return pages
+
+
+def save_fixtures():
+    FIXTURES.mkdir(exist_ok=True)
+    with httpx.Client(headers=HEADERS, follow_redirects=True, timeout=20.0) as client:
+        for source in SOURCES.values():
+            html = client.get(source.url).raise_for_status().text
+            (FIXTURES / f"{source.name}.html").write_text(html, encoding="utf-8")
+            print(f"saved {source.name}: {len(html) / 1024:.0f} KiB")
+
+
+def throughput(source, html: str, backend: str, seconds: float):
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        articles = parse_source(source, html, backend)
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed / count * 1000, len(articles)
+
+
+async def max_loop_stall(pages: dict, offload: bool, rounds: int = 5) -> float:
+    """
+    Longest gap seen by a 1ms ticker while every page is parsed `rounds` times
+    """
+    worst, running = 0.0, True
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    for _ in range(rounds):
+        for source, html in pages.items():
+            if offload:
+                await parse_articles(SOURCES[source], html)
+            else:
+                parse_source(SOURCES[source], html, parsers.PARSER_BACKEND)
+            await asyncio.sleep(0)
+    running = False
+    await task
+    return worst * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per source/backend")
+    parser.add_argument("--save-fixtures", action="store_true")
+    args = parser.parse_args()
+
+    if args.save_fixtures:
+        save_fixtures()
+    pages = load_pages()
+    backends = ["html.parser"] + (["lxml"] if LXML_AVAILABLE else []) + (["selectolax"] if SELECTOLAX_AVAILABLE else [])
+
+    print(f"{'source':<11}{'size':>9}  {'backend':<12}{'pages/s':>10}{'ms/page':>10}{'articles':>10}")
+    for source, html in pages.items():
+        for backend in backends:
+            rate, ms, found = throughput(SOURCES[source], html, backend, args.seconds)
+            print(f"{source:<11}{len(html) / 1024:>7.0f}Ki  {backend:<12}{rate:>10.1f}{ms:>10.2f}{found:>10}")
+
+    print(f"\nevent loop stall with backend={parsers.PARSER_BACKEND}:")
+    print(f"  parsed inline:       max {await max_loop_stall(pages, offload=False):8.1f}ms")
+    print(f"  via parse_articles:  max {await max_loop_stall(pages, offload=True):8.1f}ms")
+    close_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Benchmark: shared-limit accuracy and per-check cost of app.rate_limit.RateLimiter
+
+Simulates several uvicorn workers (independent RateLimiter instances, one local Redis)
+hammering the same client key, then reports how many requests each setup let through
+against the configured limit, Redis round trips, and the cost per check.
+The "per-worker" row is what an in-memory limiter (slowapi's default storage) allows:
+each worker enforces the full limit on its own.
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.rate_limiter --workers 4 --limit 600 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+import app.rate_limit as rate_limit
+from app.rate_limit import RateLimiter, RateLimitExceeded, Rate
+from app.redis_cache import redis_client
+
+
+async def run(workers: int, rate: Rate, requests: int, batch_max: int, scope: str):
+    rate_limit.LOCAL_BATCH_MAX = batch_max
+    limiters = [RateLimiter() for _ in range(workers)]
+    calls = 0
+    for limiter in limiters:
+        script = limiter.script
+
+        async def counted(*args, _script=script, **kwargs):
+            nonlocal calls
+            calls += 1
+            return await _script(*args, **kwargs)
+        limiter.script = counted
+
+    await redis_client.delete(f"ratelimit:{scope}:client")
+    allowed = 0
+
+    async def worker(limiter):
+        nonlocal allowed
+        for _ in range(requests):
+            try:
+                await limiter.hit(f"{scope}:client", rate)
+                allowed += 1
+            except RateLimitExceeded:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(limiter) for limiter in limiters))
+    elapsed = time.perf_counter() - start
+    await redis_client.delete(f"ratelimit:{scope}:client")
+    return allowed, calls, elapsed / (workers * requests) * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=600, help="requests per minute")
+    parser.add_argument("--requests", type=int, default=2000, help="attempts per worker")
+    args = parser.parse_args()
+    rate = Rate(args.limit, 60)
+
+    print(f"{args.workers} workers x {args.requests} attempts, limit {args.limit}/minute")
+    print(f"{'setup':<28}{'allowed':>9}{'redis calls':>13}{'us/check':>10}")
+    print(f"{'per-worker (in-memory)':<28}{min(args.requests, args.limit) * args.workers:>9}{0:>13}{'-':>10}")
+    for label, batch_max in (("redis, no local batch", 1), ("redis + local reservations", rate_limit.LOCAL_BATCH_MAX)):
+        allowed, calls, us = await run(args.workers, rate, args.requests, batch_max, f"bench-{batch_max}")
+        print(f"{label:<28}{allowed:>9}{calls:>13}{us:>10.1f}")
+    await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark: fetch latency per scrape cycle, new client per fetch vs the shared pooled client
+
+A cycle fetches every source once, concurrently, like get_all_news() on a cold cache.
+"before" opens and closes an httpx.AsyncClient per fetch (the old fetch_html);
+"after" goes through app.http_client's shared client, so cycles after the first reuse
+TCP/TLS connections (and HTTP/2 where the server supports it).
+
+Usage (from rate-limited-news-api/):
+    python -m benchmarks.scrape_cycle_latency --cycles 10            # live BBC / CNN / HN
+    python -m benchmarks.scrape_cycle_latency --cycles 10 --local-rtt-ms 40
+--local-rtt-ms serves a synthetic page from a local keep-alive server behind a proxy that
+adds the given round trip per exchange and two round trips per new connection (TCP + TLS).
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import httpx
+
+from app.http_client import get_http_client, close_http_client, HTTP2_ENABLED
+
+SOURCES = ["https://www.bbc.com/news", "https://edition.cnn.com/world", "https://news.ycombinator.com/"]
+HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/109.0.0.0 Safari/537.36"}
+PAGE = ("<html><body>" + "<a data-testid='internal-link' href='/news/x'>Headline</a>" * 3000 + "</body></html>").encode()
+
+
+def start_local_server(rtt_ms: float) -> list[str]:
+    """
+    Start a keep-alive HTTP server plus a latency proxy on a background thread, return source URLs
+    """
+    ready = threading.Event()
+    ports = {}
+    delay = rtt_ms / 2000
+
+    async def serve_page(reader, writer):
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n" % len(PAGE) + PAGE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def proxy(client_reader, client_writer):
+        await asyncio.sleep(4 * delay)  # two round trips of connection setup
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", ports["server"])
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+
+    async def main():
+        server = await asyncio.start_server(serve_page, "127.0.0.1", 0)
+        front = await asyncio.start_server(proxy, "127.0.0.1", 0)
+        ports["server"] = server.sockets[0].getsockname()[1]
+        ports["proxy"] = front.sockets[0].getsockname()[1]
+        ready.set()
+        await asyncio.gather(server.serve_forever(), front.serve_forever())
+
+    threading.Thread(target=lambda: asyncio.run(main()), daemon=True).start()
+    ready.wait()
+    return [f"http://127.0.0.1:{ports['proxy']}/{name}" for name in ("bbc", "cnn", "hn")]
+
+
+async def fetch_new_client(url: str):
+    async with httpx.AsyncClient(timeout=10.0, headers=HEADERS) as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def fetch_shared_client(url: str):
+    (await get_http_client().get(url, headers=HEADERS)).raise_for_status()
+
+
+async def run_cycles(fetch, urls, cycles: int):
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(url) for url in urls))
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--local-rtt-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    urls = start_local_server(args.local_rtt_ms) if args.local_rtt_ms is not None else SOURCES
+    print(f"http2 available: {HTTP2_ENABLED}, sources: {len(urls)}, cycles: {args.cycles}")
+
+    results = {}
+    for label, fetch in (("before", fetch_new_client), ("after", fetch_shared_client)):
+        durations = await run_cycles(fetch, urls, args.cycles)
+        results[label] = durations
+        print(
+            f"{label:<7} first={durations[0]:8.1f}ms  median={statistics.median(durations):8.1f}ms  "
+            f"mean(after first)={statistics.mean(durations[1:] or durations):8.1f}ms"
+        )
+    await close_http_client()
+
+    saved = statistics.median(results["before"]) - statistics.median(results["after"])
+    print(f"saved per scrape cycle (median): {saved:.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
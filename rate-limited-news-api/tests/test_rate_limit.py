@@ -0,0 +1,180 @@
+import asyncio
+import uuid
+import pytest
+import pytest_asyncio
+from redis.exceptions import RedisError
+import app.rate_limit as rate_limit
+from app.rate_limit import RateLimiter, RateLimitExceeded
+from app.rate_limit_policy import Rate
+from app.redis_cache import redis_client
+
+# Slow enough (one unit per 6s) that nothing refills while a test runs
+RATE = Rate(600, 3600)
+EMISSION_MS = RATE.period * 1000 / RATE.limit
+
+
+@pytest_asyncio.fixture
+async def prefix():
+    """
+    Unique key prefix per test against the local Redis; skips when Redis is not running
+    """
+    try:
+        await redis_client.ping()
+    except (RedisError, OSError):
+        pytest.skip("Redis is not reachable")
+    prefix = f"test-ratelimit:{uuid.uuid4().hex}"
+    yield prefix
+    keys = await redis_client.keys(f"{prefix}:*")
+    if keys:
+        await redis_client.delete(*keys)
+    # Each test runs on its own event loop; don't carry connections over
+    await redis_client.connection_pool.disconnect()
+
+
+def worker(prefix: str) -> RateLimiter:
+    """
+    One RateLimiter per simulated uvicorn worker, all sharing the same Redis keys
+    """
+    return RateLimiter(prefix=prefix)
+
+
+async def run_script(limiter, key, limit=10, requested=1, needed=1, refund=0):
+    granted, remaining, retry_after_ms, _ = await limiter.script(
+        keys=[f"{limiter.prefix}:{key}"], args=[EMISSION_MS, limit, requested, needed, refund]
+    )
+    return granted, remaining, retry_after_ms
+
+
+@pytest.mark.asyncio
+async def test_gcra_grants_up_to_limit_then_refuses(prefix):
+    """
+    Test that the script grants exactly `limit` units and then asks the client to wait
+    """
+    limiter = worker(prefix)
+    for expected_remaining in range(9, -1, -1):
+        granted, remaining, _ = await run_script(limiter, "client")
+        assert (granted, remaining) == (1, expected_remaining)
+
+    granted, remaining, retry_after_ms = await run_script(limiter, "client")
+    assert granted == 0 and remaining == 0
+    assert 0 < retry_after_ms <= EMISSION_MS # One unit frees up after one emission interval
+
+
+@pytest.mark.asyncio
+async def test_gcra_cost_is_all_or_nothing(prefix):
+    """
+    Test that a route's cost is either charged in full or not at all
+    """
+    limiter = worker(prefix)
+    assert (await run_script(limiter, "client", needed=8, requested=8))[:2] == (8, 2)
+
+    granted, remaining, _ = await run_script(limiter, "client", needed=5, requested=5)
+    assert (granted, remaining) == (0, 2) # Refused, and nothing was taken
+
+
+@pytest.mark.asyncio
+async def test_gcra_refund_returns_unspent_units(prefix):
+    """
+    Test that refunded units are available again
+    """
+    limiter = worker(prefix)
+    assert (await run_script(limiter, "client", requested=5))[:2] == (5, 5) # Reserve 5, spend 1
+
+    granted, remaining, _ = await run_script(limiter, "client", refund=4)
+    assert (granted, remaining) == (1, 8) # Only the 2 units actually spent are charged
+
+
+@pytest.mark.asyncio
+async def test_cold_client_does_not_reserve(prefix):
+    """
+    Test that occasional requests only charge their cost to the shared quota
+    """
+    first, second = worker(prefix), worker(prefix)
+    await first.hit("client", RATE)
+
+    info = await second.hit("client", RATE)
+    assert info.remaining == RATE.limit - 2
+
+
+@pytest.mark.asyncio
+async def test_steady_trickle_keeps_quota_shared(prefix, monkeypatch):
+    """
+    Test that a client spaced out past every lease never holds quota other workers can't use
+    """
+    monkeypatch.setattr(rate_limit, "LOCAL_LEASE_SECONDS", 0.05)
+    first, second = worker(prefix), worker(prefix)
+    for _ in range(5):
+        await first.hit("client", RATE)
+        await asyncio.sleep(0.06)
+
+    info = await second.hit("client", RATE)
+    assert info.remaining == RATE.limit - 6
+
+
+@pytest.mark.asyncio
+async def test_unspent_reservation_is_refunded(prefix, monkeypatch):
+    """
+    Test that a hot client's lapsed reservation is handed back on its next call
+    """
+    monkeypatch.setattr(rate_limit, "LOCAL_LEASE_SECONDS", 0.05)
+    first, second = worker(prefix), worker(prefix)
+    for _ in range(8):
+        await first.hit("client", RATE) # The third call takes a batch of 30; 5 more are spent from it
+
+    reserved = await second.hit("client", RATE)
+    assert reserved.remaining == RATE.limit - 8 - 24 - 1 # 24 units still reserved by `first`
+
+    await asyncio.sleep(0.06) # Lease lapses
+    await first.hit("client", RATE) # Refunds the 24 units it did not spend
+
+    info = await second.hit("client", RATE)
+    assert info.remaining == RATE.limit - 11
+
+
+@pytest.mark.asyncio
+async def test_hot_client_is_served_locally(prefix):
+    """
+    Test that a burst mostly spends its local reservation instead of calling Redis
+    """
+    limiter = worker(prefix)
+    calls = 0
+    script = limiter.script
+
+    async def counted(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await script(*args, **kwargs)
+    limiter.script = counted
+
+    for _ in range(30):
+        await limiter.hit("client", RATE)
+    assert calls == 3 # Two cold calls, then one batch of 30 (5% of 600) covers the rest
+
+
+@pytest.mark.asyncio
+async def test_limit_exceeded(prefix):
+    """
+    Test that an exhausted client is refused with a Retry-After, also locally afterwards
+    """
+    limiter = worker(prefix)
+    rate = Rate(3, 3600)
+    for _ in range(3):
+        await limiter.hit("client", rate)
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        await limiter.hit("client", rate)
+    assert exc.value.info.remaining == 0
+    assert int(exc.value.info.headers()["Retry-After"]) > 0
+
+    calls = 0
+    script = limiter.script
+
+    async def counted(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await script(*args, **kwargs)
+    limiter.script = counted
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.hit("client", rate)
+    assert calls == 0 # Refused from the local block without a round trip
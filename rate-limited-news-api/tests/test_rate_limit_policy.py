@@ -0,0 +1,63 @@
+import json
+import os
+import pytest
+from app.rate_limit_policy import PolicyStore, Policy, Rate, DEFAULT_CONFIG
+
+VALID = {
+    "default_tier": "anonymous",
+    "tiers": {"anonymous": {"rate": "30/minute"}, "pro": {"rate": "1200/minute"}},
+    "api_keys": {"demo-pro-key": {"tenant": "acme", "tier": "pro"}},
+    "route_costs": {"news_endpoint": 10},
+}
+
+
+def write(path, config, mtime):
+    path.write_text(config if isinstance(config, str) else json.dumps(config))
+    os.utime(path, (mtime, mtime)) # Distinct mtimes so every write is picked up
+
+
+def test_rate_parse():
+    """
+    Test rate strings, including ones that would divide by zero in the limiter
+    """
+    assert Rate.parse("3/minute") == Rate(3, 60)
+    assert Rate.parse("10 per 2 hours") == Rate(10, 7200)
+    for invalid in ("0/minute", "5/0 seconds", "fast", "-1/minute"):
+        with pytest.raises(ValueError):
+            Rate.parse(invalid)
+
+
+@pytest.mark.parametrize("broken", [
+    {**VALID, "api_keys": {"demo-pro-key": "pro"}}, # Entry written as a string
+    {**VALID, "tiers": [{"rate": "30/minute"}]}, # Tiers as a list
+    {**VALID, "tiers": {"anonymous": {"rate": "0/minute"}}}, # Zero limit
+    {**VALID, "tiers": {"anonymous": "30/minute"}}, # Tier without {"rate": ...}
+    {**VALID, "route_costs": {"news_endpoint": -1}}, # Negative cost
+    {**VALID, "route_costs": {"news_endpoint": "ten"}},
+    {**VALID, "default_tier": "gold"}, # Undefined default tier
+    ["not", "a", "mapping"],
+    "{ not json",
+])
+def test_invalid_reload_keeps_last_good_policy(tmp_path, broken):
+    """
+    Test that a broken config file is ignored on hot reload and the previous policy stays in force
+    """
+    path = tmp_path / "rate_limits.json"
+    write(path, VALID, 1_000_000)
+    store = PolicyStore(path)
+    assert store.policy.tiers["pro"] == Rate(1200, 60)
+
+    write(path, broken, 1_000_100)
+    assert store.reload() is False # Logged, not raised
+    assert store.policy.tiers["pro"] == Rate(1200, 60)
+    assert store.loaded_mtime == 1_000_100 # Not re-parsed on every check
+
+
+def test_invalid_file_at_startup_uses_defaults(tmp_path):
+    """
+    Test that a broken file at import time falls back to the built-in policy instead of crashing
+    """
+    path = tmp_path / "rate_limits.json"
+    write(path, {"tiers": [], "api_keys": "x"}, 1_000_000)
+    store = PolicyStore(path)
+    assert store.policy.tiers == Policy.from_config(DEFAULT_CONFIG).tiers
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Query, HTTPException
 from typing import Optional
 from app.services.weather_proxy import fetch_weather_data, WeatherAPIError
 from app.schemas.weather import WeatherResponse
+from app.utils.cache import get_cache_stats
 
 router = APIRouter()
 
@@ -32,4 +33,10 @@ async def get_weather(
         raise HTTPException(status_code=400, detail=str(e))
 
     except WeatherAPIError as e:
-        raise HTTPException(status_code=502, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Get in-memory cache size, hit ratio, eviction and expiry counters"""
+    return get_cache_stats()
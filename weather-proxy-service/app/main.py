@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from app.api.routes import router as weather_router
+from app.utils.cache import start_cache_sweeper, stop_cache_sweeper
 
 app = FastAPI(
     title="Weather Proxy Microservice",
@@ -7,4 +8,8 @@ app = FastAPI(
     version="0.1.0"
 )
 
-app.include_router(weather_router) # Include the weather router
\ No newline at end of file
+app.include_router(weather_router) # Include the weather router
+
+# Background sweeper drops expired cache entries that are never read again
+app.add_event_handler("startup", start_cache_sweeper)
+app.add_event_handler("shutdown", stop_cache_sweeper)
@@ -1,11 +1,160 @@
+import json
 import time
-from typing import Any, Tuple
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
 
 CACHE_TTL_SECONDS = 600  # 10 minutes
+CACHE_MAX_ENTRIES = 10_000  # bound on distinct keys (every lat/lon pair is its own key)
+CACHE_MAX_BYTES = 32 * 1024 * 1024  # bound on the estimated size of cached payloads
+CACHE_SWEEP_INTERVAL_SECONDS = 60  # how often the background sweeper drops expired entries
 
-# Structure: { key: (expires_at_timestamp, data) }
-cache_store: dict[str, Tuple[float, Any]] = {} 
 
+def estimate_size(data: Any) -> int:
+    """Approximate memory held by a cached payload (its JSON length)"""
+    try:
+        return len(json.dumps(data, default=str))
+    except (TypeError, ValueError):
+        return len(repr(data))
+
+
+class TTLCache:
+    """
+    In-memory cache bounded by entry count and total bytes
+    Entries expire after `ttl` seconds; when a bound is hit, the least recently used
+    entries are evicted. Expired entries are removed on read and by `sweep()`, which
+    the background sweeper runs periodically, so keys that are never read again
+    do not pile up.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+
+        # Structure: { key: (expires_at, size, data) }, least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str):
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self.clock()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, data = entry
+        if self.clock() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def set(self, key: str, data: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least recently used entries to stay within bounds"""
+        size = estimate_size(data)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, size, data)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def sweep(self) -> int:
+        """Remove every expired entry; returns how many were removed"""
+        now = self.clock()
+        expired = [key for key, (expires_at, _, _) in self._entries.items() if now >= expires_at]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    async def _sweep_forever(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.sweep()
+            if removed:
+                logging.info(f"[CACHE SWEEP] removed {removed} expired entries")
+
+    def start_sweeper(self, interval: float = CACHE_SWEEP_INTERVAL_SECONDS):
+        """Start the background sweeper on the running event loop (called on app startup)"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever(interval))
+
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+
+cache_store = TTLCache()
 
 
 def make_cache_key(city: str = "", lat: float = None, lon: float = None) -> str:
@@ -18,30 +167,23 @@ def make_cache_key(city: str = "", lat: float = None, lon: float = None) -> str:
 
 
 def get_from_cache(key: str):
-    """Retrieve data from cache by key"""
-    # get the entry from the cache
-    entry = cache_store.get(key) 
-
-    # if the entry does not exist or has expired, return None
-    if not entry:
-        return None
-    
-    # check if the entry has expired
-    expires_at, data = entry
-
-    # If the current time is greater than the expiration time, remove it and return None
-    if time.time() > expires_at:
-        # remove the expired entry from the cache
-        del cache_store[key]  
-        return None
-    return data
+    """Retrieve data from cache by key (None if missing or expired)"""
+    return cache_store.get(key)
 
 
 def set_cache(key: str, data: Any):
     """Store data in cache with an expiration time"""
+    cache_store.set(key, data)
+
+
+def get_cache_stats() -> dict:
+    """Size, hit, eviction and expiry counters for the shared cache"""
+    return cache_store.stats()
+
+
+async def start_cache_sweeper():
+    cache_store.start_sweeper()
+
 
-    # Set the expiration time to current time + TTL
-    expires_at = time.time() + CACHE_TTL_SECONDS
-    # Store the data in the cache with the expiration time
-    cache_store[key] = (expires_at, data)
-    
\ No newline at end of file
+async def stop_cache_sweeper():
+    await cache_store.stop_sweeper()
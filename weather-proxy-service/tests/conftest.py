@@ -0,0 +1,12 @@
+import pytest
+from app.utils.cache import cache_store
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Start and end every test with an empty shared cache, so no test is served another's entries
+    """
+    cache_store.clear()
+    yield
+    cache_store.clear()
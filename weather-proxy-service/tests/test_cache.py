@@ -0,0 +1,97 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.cache import TTLCache, make_cache_key, get_from_cache, set_cache
+
+client = TestClient(app)
+
+
+class FakeClock:
+    """
+    Manually advanced clock so expiry can be tested without sleeping
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_api_compatible():
+    """
+    Test that the module-level helpers still store and return data by key
+    """
+    assert make_cache_key(lat=14.5995, lon=120.9842) == "coords:14.5995,120.9842" # Coordinates key
+    assert make_cache_key(city="Manila") == "city:manila"
+
+    key = "test:api-compatible" # Not a key any real request uses
+    set_cache(key, {"main": {"temp": 30}})
+    assert get_from_cache(key) == {"main": {"temp": 30}}
+    assert get_from_cache("test:never-stored") is None
+
+
+def test_lru_eviction_by_entries():
+    """
+    Test that the least recently used key is evicted once max_entries is exceeded
+    """
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a") # "a" is now more recently used than "b"
+    cache.set("c", 3)
+
+    assert cache.get("b") is None # Evicted
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes():
+    """
+    Test that the total estimated size stays within max_bytes
+    """
+    cache = TTLCache(max_bytes=100)
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 30) # ~32 bytes each once JSON encoded
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert stats["entries"] == 3
+    assert cache.get("k9") is not None # Newest entries are kept
+    assert cache.get("k0") is None
+
+    cache.set("huge", "x" * 500) # Larger than the whole cache: not stored
+    assert cache.get("huge") is None
+    assert cache.stats()["entries"] == 3
+
+
+def test_expiry_and_sweep():
+    """
+    Test that expired entries are dropped on read and by the sweeper
+    """
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("read", 1)
+    cache.set("unread", 2)
+    cache.set("fresh", 3, ttl=60)
+
+    clock.now += 11 # Past the default TTL
+    assert cache.get("read") is None # Expired on read
+    assert cache.sweep() == 1 # "unread" is removed without being read
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["expirations"] == 2
+    assert cache.get("fresh") == 3
+
+
+def test_cache_stats_route():
+    """
+    Test that cache stats are exposed over HTTP
+    """
+    response = client.get("/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+
+    for key in ("entries", "bytes", "hits", "misses", "evictions", "expirations"):
+        assert key in data